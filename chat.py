@@ -1,19 +1,19 @@
 # chat.py
+import os
 import requests
 import json
 
 API_URL = "http://127.0.0.1:8000/ask"
-USER_ID = "user_1"  # Change this for different users
+API_TOKEN = os.getenv("HOME_API_TOKEN", "")  # bearer token from POST /api/auth/login
 
 def ask_question(question, top_k=3, stream=False):
     payload = {
         "question": question,
-        "user_id": USER_ID,
         "top_k": top_k,
         "stream": stream
     }
     try:
-        response = requests.post(API_URL, json=payload)
+        response = requests.post(API_URL, json=payload, headers={"Authorization": f"Bearer {API_TOKEN}"})
         response.raise_for_status()
         data = response.json()
         return data.get("answer", "No answer received.")
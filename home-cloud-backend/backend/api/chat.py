@@ -1,16 +1,36 @@
-from fastapi import APIRouter
-from schemas.chat import ChatRequest, ChatResponse
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from backend.schemas.chat import ChatRequest, ChatResponse
+from backend.auth.deps import get_current_user
+from backend.auth.cache import Principal
 from backend.core.llm.llm_router import process_prompt
-from backend.core.memory.conversation_store import save_message
+from backend.core.llm.scheduler import LLMBusy, LLMQueueTimeout
+from backend.core.memory.conversation_store import conversation_store, save_message
 
 router = APIRouter()
 
-@router.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest):
-    save_message("user", request.message)
+logger = logging.getLogger(__name__)
 
-    result = process_prompt(request.message)
+@router.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, current_user: Principal = Depends(get_current_user)):
+    # History is trimmed to a token budget, so prompts stay bounded as a chat grows
+    prompt = await asyncio.to_thread(
+        conversation_store.build_prompt, current_user.id, request.session_id, request.message
+    )
+    try:
+        # Scored on the new message alone; a prompt carrying history stays out of the shared cache
+        result = await process_prompt(request.message, prompt=prompt if prompt != request.message else None)
+    except LLMBusy:
+        raise HTTPException(status_code=429, detail="The assistant is busy, retry shortly", headers={"Retry-After": "2"})
+    except LLMQueueTimeout:
+        raise HTTPException(status_code=503, detail="Timed out waiting for the assistant")
+    except Exception:
+        logger.exception("Assistant generation failed")
+        raise HTTPException(status_code=500, detail="The assistant failed to answer")
 
-    save_message("assistant", result["reply"])
+    # Both turns are kept only once there is a reply, so a failed call leaves no orphan message
+    save_message(current_user.id, request.session_id, "user", request.message)
+    save_message(current_user.id, request.session_id, "assistant", result["reply"])
 
     return result
@@ -1,26 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import threading
-import time
-from backend.core.database import Base, engine
-from backend.services.monitor import check_websites
+from fastapi.responses import PlainTextResponse
+from backend.core.metrics import metrics
+from backend.core.schema import create_schema
 from backend.routes.website_routes import router as website_router
 from backend.routes.status_routes import router as status_router
 from backend.routes.auth_routes import router as auth_router
+from backend.routes.sla_routes import router as sla_router
+from backend.routes.live_routes import router as live_router
+from backend.routes.incident_routes import router as incident_router
+from backend.routes.export_routes import router as export_router
+from backend.routes.ai_routes import router as ai_router
+from backend.api.chat import router as chat_router
+from backend.routes.ask_routes import router as ask_router
 from backend.models.user import User
 from backend.models.website import Website
 from backend.models.tenant import Tenant
 from backend.models.monitoring_result import MonitoringResult
-from backend.services.scheduler import scheduler_loop
-from backend.services.worker_loop import worker_loop
+from backend.models.api_key import ApiKey
+from backend.models.conversation import ConversationMessage
+from backend.monitor.runtime import runtime, MONITOR_MODE
+from backend.services.ollama_service import ollama_client
+from backend.core.llm.response_cache import response_cache
+from backend.core.memory.conversation_store import conversation_store
+from backend.core.retrieval.document_index import document_index
 
 
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create tables, and add what older databases are missing
+create_schema()
 
-app = FastAPI(title="HOME Cloud Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MONITOR_MODE == "inprocess":
+        runtime.start()
+    # Index new or changed documents without holding up startup
+    indexing = asyncio.create_task(asyncio.to_thread(document_index.sync))
+    yield
+    await indexing
+    await ollama_client.close()
+    response_cache.close()
+    await asyncio.to_thread(conversation_store.stop)
+    await asyncio.to_thread(runtime.stop)
+
+app = FastAPI(title="HOME Cloud Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(website_router, prefix="/api/websites")
@@ -37,20 +64,18 @@ app.include_router(status_router, prefix="/api/status")
 def health():
     return {"status": "ok"}
 
-def monitor_loop():
-    while True:
-        check_websites()
-        time.sleep(60)
-
-@app.on_event("startup")
-def start_monitor():
-    threading.Thread(target=monitor_loop, daemon=True).start()
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return metrics.render()
 
 app.include_router(auth_router)
-@app.on_event("startup")
-def start_background_services():
-    threading.Thread(target=scheduler_loop, daemon=True).start()
-    threading.Thread(target=worker_loop, daemon=True).start()
+app.include_router(sla_router)
+app.include_router(live_router)
+app.include_router(incident_router)
+app.include_router(export_router)
+app.include_router(ai_router)
+app.include_router(chat_router, prefix="/api", tags=["AI"])
+app.include_router(ask_router)
 
 
 
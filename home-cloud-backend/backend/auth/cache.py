@@ -0,0 +1,138 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.core.metrics import metrics
+from backend.models.user import User
+from backend.models.api_key import ApiKey
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))  # entries
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))  # seconds
+
+metrics.counter("auth_cache_hits_total", "Authenticated requests served from the principal cache")
+metrics.counter("auth_cache_misses_total", "Authenticated requests that loaded the user from the database")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What routes need to know about the caller; detached from any session."""
+    id: str
+    tenant_id: str
+    is_active: bool
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of credential -> Principal. Entries live for at most `ttl`
+    seconds (or until the JWT expires, if sooner), and every entry of a
+    user is dropped when that user is deactivated or deleted, so a cached
+    credential can't outlive the account.
+    """
+
+    def __init__(self, max_size: int = AUTH_CACHE_SIZE, ttl: float = AUTH_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (principal, expires_at)
+        self._by_user = {}  # user id -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Principal]:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                metrics.inc("auth_cache_hits_total")
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+
+        metrics.inc("auth_cache_misses_total")
+        return None
+
+    def put(self, key: str, principal: Principal, expires_in: float = None):
+        ttl = self.ttl if expires_in is None else min(self.ttl, expires_in)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, time.monotonic() + ttl)
+            self._by_user.setdefault(principal.id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[0].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[0].id]
+
+
+principal_cache = PrincipalCache()
+metrics.gauge("auth_cache_entries", lambda: len(principal_cache), "Principals currently cached")
+
+
+def api_key_cache_key(key_hash: str) -> str:
+    return f"key:{key_hash}"
+
+
+# Invalidate after commit, not at flush: a request racing the
+# deactivation must not re-cache the still-committed old row.
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    users = session.info.setdefault("auth_invalidate_users", set())
+    keys = session.info.setdefault("auth_invalidate_keys", set())
+
+    for obj in session.dirty:
+        if isinstance(obj, User) and inspect(obj).attrs.is_active.history.has_changes():
+            users.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            users.add(obj.id)
+        elif isinstance(obj, ApiKey):
+            keys.add(api_key_cache_key(obj.key_hash))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for user_id in session.info.pop("auth_invalidate_users", ()):
+        principal_cache.invalidate_user(user_id)
+    for key in session.info.pop("auth_invalidate_keys", ()):
+        principal_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("auth_invalidate_users", None)
+    session.info.pop("auth_invalidate_keys", None)
@@ -1,4 +1,6 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
@@ -6,6 +8,7 @@ from sqlalchemy.orm import Session
 from backend.core.database import get_db
 from backend.models.user import User
 from backend.auth.security import SECRET_KEY, ALGORITHM
+from backend.auth.cache import Principal, principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -13,12 +16,40 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-):
+) -> Principal:
+    return authenticate_token(token, db)
+
+
+def get_stream_user(
+    request: Request,
+    access_token: str | None = Query(None),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    For EventSource clients, which can't set headers: the bearer token may
+    also be passed as ?access_token=.
+    """
+    authorization = request.headers.get("authorization", "")
+    token = authorization[7:] if authorization.lower().startswith("bearer ") else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+    return authenticate_token(token, db)
+
+
+def authenticate_token(token: str, db: Session) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
     )
 
+    # A cached token was already validated; its entry never outlives "exp"
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -27,8 +58,16 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    row = (
+        db.query(User.id, User.tenant_id, User.is_active)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not row or row.is_active is False:
         raise credentials_exception
 
-    return user
+    principal = Principal(id=row.id, tenant_id=row.tenant_id, is_active=True)
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    principal_cache.put(token, principal, expires_in)
+
+    return principal
@@ -1,20 +1,81 @@
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+
+import bcrypt
 from jose import jwt
-from passlib.context import CryptContext
+
+from backend.core.metrics import metrics
 
 SECRET_KEY = "CHANGE_THIS_IN_ENV"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))  # each +1 doubles the cost
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", 4))  # bcrypt threads
+PASSWORD_QUEUE_DEPTH = int(os.getenv("PASSWORD_QUEUE_DEPTH", 16))  # waiting hashes before 429
+
+metrics.counter("password_hashes_rejected_total", "Password hashes refused because the bcrypt pool was saturated")
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool (bcrypt releases the
+    GIL) so logins can't exhaust the request threadpool. At most
+    workers + queue_depth hashes are admitted; beyond that callers get
+    PasswordPoolBusy right away instead of queueing without limit.
+    """
+
+    def __init__(self, workers: int = PASSWORD_WORKERS, queue_depth: int = PASSWORD_QUEUE_DEPTH, rounds: int = BCRYPT_ROUNDS):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._capacity = workers + queue_depth
+        self._admitted = 0
 
+    @property
+    def in_flight(self) -> int:
+        return self._admitted
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            metrics.inc("password_hashes_rejected_total")
+            raise PasswordPoolBusy()
+
+        self._admitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._admitted -= 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    # bcrypt only uses the first 72 bytes
+    return bcrypt.hashpw(password.encode()[:72], bcrypt.gensalt(rounds)).decode()
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    try:
+        return bcrypt.checkpw(password.encode()[:72], hashed.encode())
+    except ValueError:
+        return False
+
+
+password_hasher = PasswordHasher()
+metrics.gauge("password_hashes_in_flight", lambda: password_hasher.in_flight, "Password hashes running or queued")
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -1,13 +1,29 @@
-from fastapi import Header, HTTPException
+from fastapi import Depends, Header, HTTPException
 from sqlalchemy.orm import Session
-from backend.core.database import SessionLocal
+from backend.core.database import get_db
+from backend.core.security import hash_api_key
 from backend.models.user import User
+from backend.models.api_key import ApiKey
+from backend.auth.cache import Principal, principal_cache, api_key_cache_key
 
-def get_current_user(x_api_key: str = Header(...)):
-    db: Session = SessionLocal()
+def get_current_user(x_api_key: str = Header(...), db: Session = Depends(get_db)) -> Principal:
+    key_hash = hash_api_key(x_api_key)
+    cache_key = api_key_cache_key(key_hash)
 
-    user = db.query(User).filter(User.api_token == x_api_key).first()
-    if not user:
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+
+    row = (
+        db.query(User.id, User.tenant_id, User.is_active)
+        .join(ApiKey, ApiKey.user_id == User.id)
+        .filter(ApiKey.key_hash == key_hash)
+        .first()
+    )
+    if not row or row.is_active is False:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
-    return user
+    principal = Principal(id=row.id, tenant_id=row.tenant_id, is_active=True)
+    principal_cache.put(cache_key, principal)
+
+    return principal
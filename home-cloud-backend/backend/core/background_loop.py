@@ -0,0 +1,25 @@
+import asyncio
+import threading
+
+# One asyncio loop on a daemon thread, shared by the threaded parts of the
+# app (probes, webhooks) so their aiohttp sessions and pools outlive a call.
+_loop = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="background-loop", daemon=True
+            ).start()
+
+    return _loop
+
+
+def run_coroutine(coro, timeout: float = None):
+    """Run `coro` on the shared loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
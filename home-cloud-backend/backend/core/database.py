@@ -1,5 +1,7 @@
 import os
-from sqlalchemy import create_engine
+import random
+import logging
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 DATABASE_URL = os.getenv("DATABASE_URL")  # Railway provides this automatically
@@ -8,7 +10,78 @@ if not DATABASE_URL:
     # Fallback for local dev
     DATABASE_URL = "sqlite:///../home.db"
 
-engine = create_engine(DATABASE_URL, echo=True, future=True)
+if DATABASE_URL.startswith("postgres://"):
+    # SQLAlchemy only accepts the postgresql:// scheme
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+APP_ENV = os.getenv("APP_ENV", "development")
+
+# Fraction of SQL statements logged; off in production
+SQL_ECHO_SAMPLE = float(os.getenv("SQL_ECHO_SAMPLE", 0 if APP_ENV == "production" else 0.05))
+
+# Postgres pool profile
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds
+
+# SQLite profile
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))  # ms
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))  # bytes
+
+sql_logger = logging.getLogger("backend.sql")
+
+
+def _sqlite_pragmas(wal: bool):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            # Readers no longer block the writer (and vice versa); with WAL,
+            # NORMAL sync is crash-safe and avoids an fsync per commit
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.close()
+
+    return on_connect
+
+
+def _sampled_echo(sample: float):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if random.random() < sample:
+            sql_logger.info("%s %r", statement, parameters if not executemany else "[executemany]")
+
+    return before_cursor_execute
+
+
+def build_engine(url: str = DATABASE_URL, sqlite_wal: bool = SQLITE_WAL, echo_sample: float = SQL_ECHO_SAMPLE):
+    if url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            future=True,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT / 1000},
+        )
+        event.listen(engine, "connect", _sqlite_pragmas(sqlite_wal))
+    else:
+        engine = create_engine(
+            url,
+            future=True,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+
+    if echo_sample > 0:
+        event.listen(engine, "before_cursor_execute", _sampled_echo(echo_sample))
+
+    return engine
+
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
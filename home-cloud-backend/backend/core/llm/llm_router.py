@@ -1,11 +1,52 @@
-from backend.core.llm.ollama_client import generate_response
-from backend.core.microsoft.azure_mock import analyze_sentiment, detect_risk
+import asyncio
+import logging
 
-def process_prompt(prompt: str) -> dict:
-    ai_response = generate_response(prompt)
+from backend.core.llm.scheduler import llm_scheduler, PRIORITY_INTERACTIVE
+from backend.core.llm.response_cache import response_cache
+from backend.core.metrics import metrics
+from backend.microsoft.azure_openai_mock import analyze_sentiment, detect_risk
 
-    sentiment = analyze_sentiment(prompt)
-    risk = detect_risk(prompt)
+logger = logging.getLogger(__name__)
+
+
+async def generate_reply(prompt: str, priority: int = PRIORITY_INTERACTIVE) -> str:
+    """Cached reply if there is one, otherwise a scheduled generation."""
+    model = llm_scheduler.client.model
+    reply = response_cache.get(model, prompt)
+    if reply is not None:
+        return reply
+
+    vector = None
+    if response_cache.similarity:
+        try:
+            vector = await llm_scheduler.client.embed(prompt)
+            reply = response_cache.get_similar(model, vector)
+            if reply is not None:
+                return reply
+        except Exception as e:
+            logger.warning("Prompt embedding failed, skipping similarity lookup: %s", e)
+
+    metrics.inc("llm_cache_misses_total")
+    # Queued behind the scheduler's slots; identical concurrent prompts share a generation
+    reply = await llm_scheduler.generate(prompt, priority=priority)
+    if reply:
+        await asyncio.to_thread(response_cache.put, model, prompt, reply, vector)
+    return reply
+
+
+async def process_prompt(message: str, priority: int = PRIORITY_INTERACTIVE, prompt: str = None) -> dict:
+    """
+    Reply to `message`. When given, `prompt` is what the model sees instead,
+    e.g. the message preceded by the user's conversation history; that is
+    private to the user, so it skips the shared reply cache.
+    """
+    if prompt is None:
+        ai_response = await generate_reply(message, priority=priority)
+    else:
+        ai_response = await llm_scheduler.generate(prompt, priority=priority)
+
+    sentiment = analyze_sentiment(message)
+    risk = detect_risk(message)
 
     return {
         "reply": ai_response,
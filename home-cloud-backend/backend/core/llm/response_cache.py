@@ -0,0 +1,198 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from backend.core.metrics import metrics
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "../llm_cache.db")  # "" = memory only
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 3600))  # seconds; answers go stale with site state
+# Cosine similarity for the embedding tier; 0 disables it
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", 0))
+
+ENTRY_OVERHEAD = 200  # bytes of bookkeeping per entry, roughly
+
+metrics.counter("llm_cache_exact_hits_total", "Assistant replies served by exact prompt match")
+metrics.counter("llm_cache_semantic_hits_total", "Assistant replies served by embedding similarity")
+metrics.counter("llm_cache_misses_total", "Assistant prompts that needed a generation")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.casefold().split()).rstrip("?!. ")
+
+
+class _Entry:
+    __slots__ = ("key", "model", "prompt", "response", "vector", "created_at", "size")
+
+    def __init__(self, key, model, prompt, response, vector, created_at):
+        self.key = key
+        self.model = model
+        self.prompt = prompt
+        self.response = response
+        self.vector = vector  # unit-length float32, or None
+        self.created_at = created_at
+        self.size = len(prompt) + len(response) + ENTRY_OVERHEAD + (vector.nbytes if vector is not None else 0)
+
+
+class ResponseCache:
+    """
+    Assistant replies by (model, normalized prompt), in an LRU bounded by
+    `max_bytes` with a `ttl`. An optional second tier matches prompts whose
+    embedding is within `similarity` (cosine) of a cached one. Entries are
+    written through to a SQLite file and reloaded at startup, so the cache
+    survives restarts.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        ttl: float = LLM_CACHE_TTL,
+        similarity: float = LLM_CACHE_SIMILARITY,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries = OrderedDict()  # key -> _Entry
+        self._bytes = 0
+        self._matrix = None  # (keys, stacked vectors) for the similarity tier
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._open()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode()).hexdigest()
+
+    def _open(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, model TEXT, prompt TEXT, response TEXT,"
+            " embedding BLOB, created_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_created_at ON llm_cache (created_at)")
+
+        cutoff = time.time() - self.ttl
+        self._db.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+        rows = self._db.execute(
+            "SELECT key, model, prompt, response, embedding, created_at FROM llm_cache ORDER BY created_at"
+        ).fetchall()
+        for key, model, prompt, response, embedding, created_at in rows:
+            vector = np.frombuffer(embedding, dtype=np.float32) if embedding else None
+            self._insert(_Entry(key, model, prompt, response, vector, created_at))
+        self._db.commit()
+        logger.info("Loaded %d cached assistant replies", len(self._entries))
+
+    def get(self, model: str, prompt: str):
+        key = self.make_key(model, prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.time() - entry.created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    metrics.inc("llm_cache_exact_hits_total")
+                    return entry.response
+                self._remove(key)
+        return None
+
+    def get_similar(self, model: str, vector):
+        """Best cached reply whose prompt embedding is close enough, if any."""
+        vector = _unit(vector)
+        with self._lock:
+            if self._matrix is None:
+                candidates = [e for e in self._entries.values() if e.vector is not None and len(e.vector) == len(vector)]
+                self._matrix = (
+                    [e.key for e in candidates],
+                    np.stack([e.vector for e in candidates]) if candidates else None,
+                )
+            keys, matrix = self._matrix
+
+        if matrix is None:
+            return None
+
+        scores = matrix @ vector
+        for index in np.argsort(scores)[::-1][:5]:
+            if scores[index] < self.similarity:
+                break
+            with self._lock:
+                entry = self._entries.get(keys[index])
+                if entry is None or entry.model != model or time.time() - entry.created_at >= self.ttl:
+                    continue
+                self._entries.move_to_end(entry.key)
+            metrics.inc("llm_cache_semantic_hits_total")
+            return entry.response
+        return None
+
+    def put(self, model: str, prompt: str, response: str, vector=None):
+        entry = _Entry(
+            self.make_key(model, prompt), model, prompt, response,
+            _unit(vector) if vector is not None else None, time.time(),
+        )
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            evicted = self._insert(entry)
+            if self._db is not None:
+                if evicted:
+                    self._db.executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in evicted])
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry.key, model, prompt, response,
+                     entry.vector.tobytes() if entry.vector is not None else None, entry.created_at),
+                )
+                self._db.commit()
+
+    def _insert(self, entry) -> list:
+        self._remove(entry.key)
+        self._entries[entry.key] = entry
+        self._bytes += entry.size
+        self._matrix = None
+
+        evicted = []
+        while self._bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            self._remove(key)
+            evicted.append(key)
+        return evicted
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            self._matrix = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+response_cache = ResponseCache()
+metrics.gauge("llm_cache_entries", lambda: len(response_cache), "Cached assistant replies")
+metrics.gauge("llm_cache_bytes", lambda: response_cache.size_bytes, "Approximate size of cached assistant replies")
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import heapq
+import asyncio
+import itertools
+
+from backend.core.metrics import metrics
+from backend.services.ollama_service import ollama_client
+
+LLM_SLOTS = int(os.getenv("LLM_SLOTS", 2))  # concurrent generations the model server handles well
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", 32))  # waiting requests before 429
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", 30))  # max seconds waiting for a slot
+
+PRIORITY_INTERACTIVE = 0  # lower runs first
+PRIORITY_BACKGROUND = 10
+
+metrics.counter("llm_requests_total", "Generations started")
+metrics.counter("llm_coalesced_total", "Requests that joined an identical in-flight generation")
+metrics.counter("llm_rejected_total", "Requests rejected because the LLM queue was full")
+metrics.counter("llm_expired_total", "Requests that waited past their deadline")
+metrics.counter("llm_queue_wait_seconds_total", "Total time requests waited for a slot")
+
+
+class LLMBusy(Exception):
+    pass
+
+
+class LLMQueueTimeout(Exception):
+    pass
+
+
+class Lease:
+    """A held slot; release() is idempotent."""
+
+    def __init__(self, scheduler):
+        self._scheduler = scheduler
+        self._held = True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._scheduler._release()
+
+
+class LLMScheduler:
+    """
+    Admission control in front of the model server, on the API event loop.
+
+    - `slots` generations run at once; the rest wait in a priority queue
+      (lower priority value first, FIFO within a priority)
+    - a full queue rejects at once (LLMBusy) instead of piling up
+    - a waiter whose deadline passes leaves the queue (LLMQueueTimeout)
+    - identical concurrent generate() calls share one generation
+    """
+
+    def __init__(
+        self,
+        client=ollama_client,
+        slots: int = LLM_SLOTS,
+        queue_size: int = LLM_QUEUE_SIZE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+    ):
+        self.client = client
+        self.slots = slots
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._free = slots
+        self._heap = []  # (priority, seq, future); cancelled futures are skipped
+        self._waiting = 0
+        self._seq = itertools.count()
+        self._inflight = {}  # dedup key -> [task, waiting callers]
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @property
+    def busy_slots(self) -> int:
+        return self.slots - self._free
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: float = None) -> Lease:
+        await self._acquire(priority, timeout)
+        return Lease(self)
+
+    async def _acquire(self, priority: int, timeout: float = None):
+        if self._free > 0 and not self._waiting:
+            self._free -= 1
+            return
+
+        if self._waiting >= self.queue_size:
+            metrics.inc("llm_rejected_total")
+            raise LLMBusy()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), future))
+        self._waiting += 1
+        enqueued_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(future, self.queue_timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self._waiting -= 1
+            metrics.inc("llm_expired_total")
+            raise LLMQueueTimeout()
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # granted just as the caller went away
+            else:
+                self._waiting -= 1
+            raise
+        finally:
+            metrics.inc("llm_queue_wait_seconds_total", time.monotonic() - enqueued_at)
+
+    def _release(self):
+        while self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            if future.done():
+                continue  # expired or cancelled
+            self._waiting -= 1
+            future.set_result(None)  # hand the slot over directly
+            return
+        self._free += 1
+
+    async def _generate(self, prompt, priority, timeout, options):
+        await self._acquire(priority, timeout)
+        try:
+            metrics.inc("llm_requests_total")
+            return await self.client.generate(prompt, **options)
+        finally:
+            self._release()
+
+    async def generate(self, prompt: str, priority: int = PRIORITY_INTERACTIVE, timeout: float = None, **options) -> str:
+        key = (" ".join(prompt.split()), json.dumps(options, sort_keys=True))
+
+        entry = self._inflight.get(key)
+        if entry is not None:
+            metrics.inc("llm_coalesced_total")
+        else:
+            task = asyncio.ensure_future(self._generate(prompt, priority, timeout, options))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t: self._done(key, t))
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded: one caller going away must not cancel the others' answer
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()  # nobody is waiting for it any more
+
+    def _done(self, key, task):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    async def stream(self, prompt: str, priority: int = PRIORITY_INTERACTIVE, timeout: float = None, lease: Lease = None, **options):
+        """
+        Yield tokens from a slot; streams are never coalesced. Pass a lease
+        taken with acquire() to queue before the response has started.
+        """
+        lease = lease or await self.acquire(priority, timeout)
+        try:
+            metrics.inc("llm_requests_total")
+            async for token in self.client.stream(prompt, **options):
+                yield token
+        finally:
+            lease.release()
+
+
+llm_scheduler = LLMScheduler()
+metrics.gauge("llm_queue_depth", lambda: llm_scheduler.queue_depth, "Requests waiting for an LLM slot")
+metrics.gauge("llm_slots_busy", lambda: llm_scheduler.busy_slots, "LLM generations running")
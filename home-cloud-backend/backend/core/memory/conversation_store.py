@@ -0,0 +1,224 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from backend.core.database import SessionLocal
+from backend.core.metrics import metrics
+from backend.models.conversation import ConversationMessage
+
+CONVERSATION_BUFFER_TURNS = int(os.getenv("CONVERSATION_BUFFER_TURNS", 40))  # messages kept in memory per session
+CONVERSATION_CONTEXT_TOKENS = int(os.getenv("CONVERSATION_CONTEXT_TOKENS", 1500))  # history budget per prompt
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", 10000))
+CONVERSATION_IDLE_TTL = float(os.getenv("CONVERSATION_IDLE_TTL", 1800))  # seconds before a session leaves memory
+CONVERSATION_FLUSH_SIZE = int(os.getenv("CONVERSATION_FLUSH_SIZE", 200))  # messages per batch
+CONVERSATION_FLUSH_INTERVAL = float(os.getenv("CONVERSATION_FLUSH_INTERVAL", 1.0))  # seconds
+
+metrics.counter("conversation_messages_written_total", "Conversation messages persisted")
+metrics.counter("conversation_sessions_loaded_total", "Conversation sessions reloaded from the database")
+metrics.counter("conversation_sessions_evicted_total", "Idle conversation sessions dropped from memory")
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text, plus the role prefix
+    return len(text) // 4 + 4
+
+
+class _Session:
+    __slots__ = ("turns", "last_seen")
+
+    def __init__(self, turns):
+        self.turns = turns  # deque of (role, content, tokens), oldest first
+        self.last_seen = time.monotonic()
+
+
+class ConversationStore:
+    """
+    Chat history per (user, session). The latest `buffer_turns` messages of
+    each active session live in a ring buffer; every message is also
+    queued and written to conversation_messages in batches by a
+    background thread, like ResultWriter. Sessions idle for `idle_ttl`
+    seconds, or beyond `max_sessions`, leave memory and are reloaded from
+    the table on their next message.
+    """
+
+    def __init__(
+        self,
+        buffer_turns: int = CONVERSATION_BUFFER_TURNS,
+        max_sessions: int = CONVERSATION_MAX_SESSIONS,
+        idle_ttl: float = CONVERSATION_IDLE_TTL,
+        flush_size: int = CONVERSATION_FLUSH_SIZE,
+        flush_interval: float = CONVERSATION_FLUSH_INTERVAL,
+    ):
+        self.buffer_turns = buffer_turns
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._sessions = OrderedDict()  # (user_id, session_id) -> _Session, least recent first
+        self._lock = threading.Lock()
+        self._pending = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def append(self, user_id: str, session_id: str, role: str, content: str):
+        tokens = estimate_tokens(content)
+        session = self._session(user_id, session_id)
+        with self._lock:
+            session.turns.append((role, content, tokens))
+
+        if not self._running:
+            self.start()
+        with self._cond:
+            self._pending.append({
+                "user_id": user_id,
+                "session_id": session_id,
+                "role": role,
+                "content": content,
+                "tokens": tokens,
+                "created_at": datetime.utcnow(),
+            })
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify()
+
+    def context(self, user_id: str, session_id: str, budget: int = CONVERSATION_CONTEXT_TOKENS) -> list:
+        """Most recent (role, content) turns that fit in `budget` tokens, oldest first."""
+        session = self._session(user_id, session_id)
+        picked = []
+        with self._lock:
+            for role, content, tokens in reversed(session.turns):
+                if tokens > budget:
+                    break
+                budget -= tokens
+                picked.append((role, content))
+        picked.reverse()
+        return picked
+
+    def build_prompt(self, user_id: str, session_id: str, message: str, budget: int = CONVERSATION_CONTEXT_TOKENS) -> str:
+        """The new message preceded by as much history as fits the budget."""
+        budget -= estimate_tokens(message)
+        lines = [f"{role.capitalize()}: {content}" for role, content in self.context(user_id, session_id, budget)]
+        if not lines:
+            return message
+        lines.append(f"User: {message}")
+        lines.append("Assistant:")
+        return "\n".join(lines)
+
+    def _session(self, user_id, session_id) -> _Session:
+        key = (user_id, session_id)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                session.last_seen = time.monotonic()
+                self._sessions.move_to_end(key)
+                return session
+
+        turns = self._load(user_id, session_id)
+
+        with self._lock:
+            session = self._sessions.get(key)  # another thread may have loaded it meanwhile
+            if session is None:
+                session = self._sessions[key] = _Session(turns)
+            self._sessions.move_to_end(key)
+            self._evict()
+            return session
+
+    def _load(self, user_id, session_id) -> deque:
+        self.flush()  # the session's last messages may still be queued
+
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(ConversationMessage.role, ConversationMessage.content, ConversationMessage.tokens)
+                .where(ConversationMessage.user_id == user_id, ConversationMessage.session_id == session_id)
+                .order_by(ConversationMessage.id.desc())
+                .limit(self.buffer_turns)
+            ).all()
+        finally:
+            db.close()
+
+        if rows:
+            metrics.inc("conversation_sessions_loaded_total")
+        return deque((tuple(r) for r in reversed(rows)), maxlen=self.buffer_turns)
+
+    def _evict(self):
+        now = time.monotonic()
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - session.last_seen < self.idle_ttl:
+                break
+            del self._sessions[key]
+            metrics.inc("conversation_sessions_evicted_total")
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="conversation-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._pending) < self.flush_size:
+                    self._cond.wait(self.flush_interval)
+                running = self._running
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing conversation messages failed")
+
+            with self._lock:
+                self._evict()
+
+            if not running:
+                return
+
+    def flush(self):
+        with self._cond:
+            batch, self._pending = self._pending, []
+
+        if not batch:
+            return
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(ConversationMessage), batch)
+            db.commit()
+        except Exception:
+            with self._cond:
+                self._pending[:0] = batch  # retried on the next flush
+            raise
+        finally:
+            db.close()
+        metrics.inc("conversation_messages_written_total", len(batch))
+
+
+conversation_store = ConversationStore()
+metrics.gauge("conversation_sessions", lambda: len(conversation_store), "Conversation sessions held in memory")
+
+
+def save_message(user_id: str, session_id: str, role: str, content: str):
+    conversation_store.append(user_id, session_id, role, content)
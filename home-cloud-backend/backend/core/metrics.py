@@ -0,0 +1,53 @@
+import threading
+
+
+class Metrics:
+    """
+    Process-wide counters and gauges, rendered in the Prometheus text
+    format by GET /metrics. Gauges are callables read at scrape time.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = ""):
+        with self._lock:
+            self._counters.setdefault(name, 0)
+            self._help[name] = help
+
+    def inc(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, fn, help: str = ""):
+        with self._lock:
+            self._gauges[name] = fn
+            self._help[name] = help
+
+    def value(self, name: str):
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            fn = self._gauges.get(name)
+        return fn() if fn is not None else None
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            help = dict(self._help)
+
+        lines = []
+        for kind, items in (("counter", counters), ("gauge", [(n, fn()) for n, fn in gauges])):
+            for name, value in items:
+                if help.get(name):
+                    lines.append(f"# HELP {name} {help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,387 @@
+import os
+import re
+import json
+import math
+import time
+import zlib
+import logging
+import threading
+
+import numpy as np
+
+from backend.core.metrics import metrics
+from backend.core.background_loop import run_coroutine
+from backend.services.ollama_service import ollama_client, EMBED_MODEL
+
+DOCUMENTS_DIR = os.getenv("DOCUMENTS_DIR", "../documents")
+DOCUMENT_INDEX_DIR = os.getenv("DOCUMENT_INDEX_DIR", "../document_index")
+DOCUMENT_EXTENSIONS = tuple(os.getenv("DOCUMENT_EXTENSIONS", ".txt,.md").split(","))
+DOCUMENT_EMBEDDER = os.getenv("DOCUMENT_EMBEDDER", "hashing")  # "hashing" or "ollama"
+DOCUMENT_HASH_DIM = int(os.getenv("DOCUMENT_HASH_DIM", 1024))
+DOCUMENT_CHUNK_CHARS = int(os.getenv("DOCUMENT_CHUNK_CHARS", 800))
+DOCUMENT_CHUNK_OVERLAP = int(os.getenv("DOCUMENT_CHUNK_OVERLAP", 100))  # chars repeated between chunks
+DOCUMENT_SYNC_INTERVAL = float(os.getenv("DOCUMENT_SYNC_INTERVAL", 30))  # min seconds between directory scans
+# Above this many chunks, search an inverted-file index instead of every row
+DOCUMENT_ANN_MIN_ROWS = int(os.getenv("DOCUMENT_ANN_MIN_ROWS", 50000))
+DOCUMENT_ANN_PROBES = int(os.getenv("DOCUMENT_ANN_PROBES", 8))  # clusters scanned per query
+
+metrics.counter("document_chunks_added_total", "Document chunks embedded and indexed")
+metrics.counter("document_chunks_deleted_total", "Document chunks removed from the index")
+metrics.counter("document_searches_total", "Document index searches")
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    Stateless bag of words and bigrams hashed into `dim` signed buckets,
+    log-scaled and L2-normalized. No model, no vocabulary to keep in sync.
+    """
+
+    def __init__(self, dim: int = DOCUMENT_HASH_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: list) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = TOKEN_RE.findall(text.lower())
+            row = out[i]
+            for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(term.encode())  # stable across processes, unlike hash()
+                row[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+            np.copysign(np.log1p(np.abs(row)), row, out=row)
+        return _normalize(out)
+
+
+class OllamaEmbedder:
+    """Embeddings from the local Ollama model; the dimension is learned on first use."""
+
+    def __init__(self, client=ollama_client, model: str = EMBED_MODEL):
+        self.client = client
+        self.model = model
+        self.dim = None
+        self.name = f"ollama:{model}"
+
+    def embed(self, texts: list) -> np.ndarray:
+        vectors = np.array([run_coroutine(self.client.embed(text, self.model)) for text in texts], dtype=np.float32)
+        self.dim = vectors.shape[1]
+        return _normalize(vectors)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def chunk_text(text: str, size: int = DOCUMENT_CHUNK_CHARS, overlap: int = DOCUMENT_CHUNK_OVERLAP) -> list:
+    words = text.split()
+    chunks = []
+    start = 0
+    while start < len(words):
+        end, length = start, 0
+        while end < len(words) and (length == 0 or length + len(words[end]) < size):
+            length += len(words[end]) + 1
+            end += 1
+        chunks.append(" ".join(words[start:end]))
+        if end == len(words):
+            break
+
+        # Step back so the next chunk repeats ~overlap chars of this one
+        back, length = end, 0
+        while back > start + 1 and length < overlap:
+            back -= 1
+            length += len(words[back]) + 1
+        start = back
+    return chunks
+
+
+class _InvertedFileIndex:
+    """
+    Rows grouped around sqrt(n) centroids (spherical k-means); a query scans
+    only the rows of its `probes` closest clusters.
+    """
+
+    def __init__(self, matrix, rows, iterations: int = 5):
+        n = len(rows)
+        k = max(1, int(math.sqrt(n)))
+        rng = np.random.default_rng(0)
+        centroids = matrix[rng.choice(rows, size=k, replace=False)].astype(np.float32)
+
+        for _ in range(iterations):
+            assignment = self._assign(matrix, rows, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, matrix[rows])
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        self.centroids = centroids
+        assignment = self._assign(matrix, rows, centroids)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(k + 1))
+        self.lists = [list(rows[order[bounds[c]:bounds[c + 1]]]) for c in range(k)]
+
+    @staticmethod
+    def _assign(matrix, rows, centroids, block: int = 8192):
+        return np.concatenate([
+            np.argmax(matrix[rows[i:i + block]] @ centroids.T, axis=1)
+            for i in range(0, len(rows), block)
+        ])
+
+    def add(self, row, vector):
+        self.lists[int(np.argmax(self.centroids @ vector))].append(row)
+
+    def candidates(self, query, probes: int) -> np.ndarray:
+        closest = np.argsort(self.centroids @ query)[::-1][:probes]
+        return np.array([row for c in closest for row in self.lists[c]], dtype=np.int64)
+
+
+class DocumentIndex:
+    """
+    Chunks of the files under `documents_dir`, embedded into a float32
+    matrix memory-mapped from `index_dir`/vectors.npy. manifest.json maps
+    files to their rows (with mtime and size) and rows to chunk text.
+
+    sync() re-embeds only files that were added or changed and frees the
+    rows of changed or deleted ones for reuse; search() is one matrix-vector
+    product over the live rows (or over a few clusters of them, past
+    `ann_min_rows`) and never waits for a sync: it only schedules one in
+    the background.
+    """
+
+    def __init__(
+        self,
+        documents_dir: str = DOCUMENTS_DIR,
+        index_dir: str = DOCUMENT_INDEX_DIR,
+        embedder=None,
+        sync_interval: float = DOCUMENT_SYNC_INTERVAL,
+        ann_min_rows: int = DOCUMENT_ANN_MIN_ROWS,
+        ann_probes: int = DOCUMENT_ANN_PROBES,
+    ):
+        self.documents_dir = documents_dir
+        self.index_dir = index_dir
+        self.embedder = embedder or (OllamaEmbedder() if DOCUMENT_EMBEDDER == "ollama" else HashingEmbedder())
+        self.sync_interval = sync_interval
+        self.ann_min_rows = ann_min_rows
+        self.ann_probes = ann_probes
+
+        self._lock = threading.RLock()  # index state; held only briefly
+        self._sync_lock = threading.Lock()  # one sync at a time
+        self._loaded = False
+        self._last_sync = 0.0
+        self._matrix = None  # np.memmap, capacity x dim
+        self._files = {}  # relative path -> {"mtime", "size", "rows"}
+        self._chunks = []  # row -> {"source", "text"} or None when free
+        self._live = np.zeros(0, dtype=bool)  # per row of the matrix's capacity
+        self._free = []
+        self._ann = None
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.index_dir, "vectors.npy")
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.index_dir, "manifest.json")
+
+    def __len__(self):
+        return int(self._live.sum())
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with open(self._manifest_path) as f:
+                manifest = json.load(f)
+            if manifest["embedder"] != self.embedder.name:
+                logger.info("Document embedder changed, rebuilding the index")
+                return
+            self._matrix = np.load(self._vectors_path, mmap_mode="r+")
+        except (OSError, ValueError, KeyError):
+            return  # nothing usable on disk; sync() builds it
+
+        self._files = manifest["files"]
+        self._chunks = manifest["chunks"]
+        self._live = np.zeros(self._matrix.shape[0], dtype=bool)
+        self._live[:len(self._chunks)] = [c is not None for c in self._chunks]
+        self._free = [row for row, c in enumerate(self._chunks) if c is None]
+        logger.info("Loaded %d document chunks from %s", len(self), self.index_dir)
+
+    def maybe_sync(self):
+        """Start a background sync() if the last scan is older than sync_interval."""
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        self._last_sync = time.monotonic()
+        threading.Thread(target=self._background_sync, name="document-sync", daemon=True).start()
+
+    def _background_sync(self):
+        if not self._sync_lock.acquire(blocking=False):
+            return  # one is already running
+        try:
+            self._sync()
+        except Exception:
+            logger.exception("Document index sync failed")
+        finally:
+            self._sync_lock.release()
+
+    def sync(self):
+        with self._sync_lock:
+            self._sync()
+
+    def _scan(self) -> dict:
+        seen = {}
+        for root, _, names in os.walk(self.documents_dir):
+            for name in names:
+                if not name.endswith(DOCUMENT_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed since the walk listed it
+                seen[os.path.relpath(path, self.documents_dir)] = (stat.st_mtime, stat.st_size)
+        return seen
+
+    def _sync(self):
+        """
+        Reading and embedding happen without the index lock, so searches
+        carry on meanwhile; each file's rows are swapped in under it.
+        """
+        with self._lock:
+            self._load()
+            known = {source: self._stat(source) for source in self._files}
+        self._last_sync = time.monotonic()
+
+        seen = self._scan()
+        released, added = [], 0
+
+        for source in known:
+            if seen.get(source) != known[source]:
+                with self._lock:
+                    released.extend(self._release(source))
+
+        for source, (mtime, size) in seen.items():
+            if known.get(source) == (mtime, size):
+                continue
+            try:
+                with open(os.path.join(self.documents_dir, source), encoding="utf-8", errors="replace") as f:
+                    chunks = chunk_text(f.read())
+            except OSError:
+                continue  # gone again; the next scan settles it
+            vectors = self.embedder.embed(chunks) if chunks else []
+
+            with self._lock:
+                rows = self._add(source, chunks, vectors)
+                self._files[source] = {"mtime": mtime, "size": size, "rows": rows}
+            added += len(rows)
+
+        metrics.inc("document_chunks_deleted_total", len(released))
+        metrics.inc("document_chunks_added_total", added)
+
+        if added or released:
+            with self._lock:
+                self._save()
+                # Freed rows are only reused once the manifest no longer points at them
+                self._free.extend(released)
+                if released:
+                    self._ann = None  # rebuilt on the next large search
+            logger.info("Document index: %d chunks added, %d removed", added, len(released))
+
+    def _release(self, source) -> list:
+        rows = self._files.pop(source)["rows"]
+        for row in rows:
+            self._chunks[row] = None
+            self._live[row] = False
+        return rows
+
+    def _stat(self, source):
+        entry = self._files[source]
+        return entry["mtime"], entry["size"]
+
+    def _add(self, source, chunks, vectors) -> list:
+        rows = []
+        for text, vector in zip(chunks, vectors):
+            row = self._free.pop() if self._free else self._grow()
+            self._matrix[row] = vector
+            self._chunks[row] = {"source": source, "text": text}
+            self._live[row] = True
+            if self._ann is not None:
+                self._ann.add(row, vector)
+            rows.append(row)
+        return rows
+
+    def _grow(self) -> int:
+        row = len(self._chunks)
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if row >= capacity:
+            new_capacity = max(1024, capacity * 2)
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp = self._vectors_path + ".tmp"
+            matrix = np.lib.format.open_memmap(
+                tmp, mode="w+", dtype=np.float32, shape=(new_capacity, self.embedder.dim)
+            )
+            if capacity:
+                matrix[:capacity] = self._matrix
+            matrix.flush()
+            del matrix
+            self._matrix = None
+            os.replace(tmp, self._vectors_path)
+            self._matrix = np.load(self._vectors_path, mmap_mode="r+")
+
+            live = np.zeros(new_capacity, dtype=bool)
+            live[:len(self._live)] = self._live
+            self._live = live
+
+        self._chunks.append(None)
+        return row
+
+    def _save(self):
+        self._matrix.flush()  # vectors before the manifest that points at them
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"embedder": self.embedder.name, "files": self._files, "chunks": self._chunks}, f)
+        os.replace(tmp, self._manifest_path)
+
+    def search(self, query: str, top_k: int = 3) -> list:
+        """[(score, source, text)] of the top_k chunks most similar to query."""
+        self.maybe_sync()
+        vector = self.embedder.embed([query])[0]
+
+        with self._lock:
+            self._load()  # serve what is on disk while the first sync runs
+            n_rows = len(self._chunks)
+            if not self._live.any():
+                return []
+            metrics.inc("document_searches_total")
+
+            if len(self) >= self.ann_min_rows:
+                if self._ann is None:
+                    self._ann = _InvertedFileIndex(self._matrix, np.flatnonzero(self._live))
+                rows = self._ann.candidates(vector, self.ann_probes)
+                rows = rows[self._live[rows]]
+                if not len(rows):
+                    return []  # the probed clusters hold only deleted rows
+                scores = self._matrix[rows] @ vector
+            else:
+                rows = np.arange(n_rows)
+                scores = self._matrix[:n_rows] @ vector
+                scores[~self._live[:n_rows]] = -np.inf
+
+            k = min(top_k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [
+                (float(scores[i]), self._chunks[rows[i]]["source"], self._chunks[rows[i]]["text"])
+                for i in best
+                if scores[i] > 0  # nothing in common with the query
+            ]
+
+
+document_index = DocumentIndex()
+metrics.gauge("document_chunks", lambda: len(document_index), "Document chunks in the retrieval index")
@@ -0,0 +1,114 @@
+import logging
+
+from sqlalchemy import MetaData, inspect, select, update
+from sqlalchemy.schema import CreateTable
+
+from backend.core.database import Base, engine
+
+logger = logging.getLogger(__name__)
+
+# Run before creating a unique index over rows that predate it, to drop
+# the ones it would reject; duplicate pending jobs are redundant anyway
+_BEFORE_INDEX = {
+    "uq_monitor_jobs_pending_website": (
+        "DELETE FROM monitor_jobs WHERE status = 'pending' AND id NOT IN "
+        "(SELECT MIN(id) FROM monitor_jobs WHERE status = 'pending' GROUP BY website_id)"
+    ),
+}
+
+
+def create_schema(bind=engine):
+    """
+    create_all() plus an idempotent upgrade of tables that already exist,
+    since create_all() never alters them: missing columns are added (and
+    backfilled from their defaults), columns whose type or NOT NULL no
+    longer match the model are changed, and missing indexes are created.
+    There is no migration tooling; this covers additive model changes.
+    """
+    existing = set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind=bind)
+
+    for table in Base.metadata.sorted_tables:
+        if table.name in existing:
+            _upgrade_table(bind, table)
+
+
+def _upgrade_table(bind, table):
+    inspector = inspect(bind)
+    columns = {c["name"]: c for c in inspector.get_columns(table.name)}
+
+    added = [c for c in table.columns if c.name not in columns]
+    changed = [
+        c for c in table.columns
+        if c.name in columns and _differs(c, columns[c.name])
+    ]
+
+    with bind.begin() as conn:
+        for column in added:
+            column_type = column.type.compile(dialect=bind.dialect)
+            conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}')
+            _backfill(conn, table, column)
+            logger.info("Added column %s.%s", table.name, column.name)
+
+        if changed and bind.dialect.name == "sqlite":
+            _rebuild_sqlite_table(conn, table)
+            logger.info("Rebuilt table %s for %s", table.name, ", ".join(c.name for c in changed))
+        elif changed:
+            for column in changed:
+                if column.type._type_affinity is not columns[column.name]["type"]._type_affinity:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" '
+                        f'TYPE {column_type} USING "{column.name}"::{column_type}'
+                    )
+                if column.nullable:
+                    conn.exec_driver_sql(f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" DROP NOT NULL')
+                logger.info("Altered column %s.%s", table.name, column.name)
+
+    indexes = {i["name"] for i in inspect(bind).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in indexes:
+            continue
+        try:
+            if index.name in _BEFORE_INDEX:
+                with bind.begin() as conn:
+                    conn.exec_driver_sql(_BEFORE_INDEX[index.name])
+            index.create(bind)
+        except Exception:
+            # e.g. a unique index over rows that predate it and collide
+            logger.exception("Could not create index %s on %s", index.name, table.name)
+
+
+def _differs(column, reflected) -> bool:
+    if column.nullable and not reflected["nullable"] and not column.primary_key:
+        return True
+    return column.type._type_affinity is not reflected["type"]._type_affinity
+
+
+def _backfill(conn, table, column):
+    default = column.default
+    if default is None or not (default.is_scalar or default.is_callable):
+        return
+    if default.is_scalar:
+        conn.execute(update(table).where(column.is_(None)).values({column.name: default.arg}))
+        return
+
+    # Per-row defaults, e.g. unguessable tokens
+    (pk,) = table.primary_key.columns
+    for (row_id,) in conn.execute(select(pk).where(column.is_(None))).all():
+        conn.execute(update(table).where(pk == row_id).values({column.name: default.arg(None)}))
+
+
+def _rebuild_sqlite_table(conn, table):
+    # SQLite can't ALTER a column's type or NOT NULL: copy into a table
+    # created from the model, then swap it in. Other tables' foreign keys
+    # name the table, not its storage, so they keep pointing at it.
+    scratch = MetaData()
+    for other in table.metadata.sorted_tables:
+        other.to_metadata(scratch)  # so the copy's foreign keys resolve
+    tmp = table.to_metadata(scratch, name=f"_{table.name}_new")
+    names = ", ".join(f'"{c.name}"' for c in table.columns)  # all present by now
+    conn.exec_driver_sql(str(CreateTable(tmp).compile(dialect=conn.dialect)))
+    conn.exec_driver_sql(f"INSERT INTO {tmp.name} ({names}) SELECT {names} FROM {table.name}")
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {tmp.name} RENAME TO {table.name}")
@@ -0,0 +1,14 @@
+import hashlib
+import secrets
+
+API_KEY_PREFIX = "hc_"
+
+
+def generate_api_key() -> str:
+    return API_KEY_PREFIX + secrets.token_urlsafe(32)
+
+
+def hash_api_key(key: str) -> str:
+    # Keys are 256-bit random, so a fast unsalted hash is enough and keeps
+    # the lookup a single indexed equality match
+    return hashlib.sha256(key.encode()).hexdigest()
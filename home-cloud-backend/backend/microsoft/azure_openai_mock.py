@@ -3,3 +3,25 @@ def generate_response(prompt: str) -> str:
     Mock Azure OpenAI response for demo purposes
     """
     return f"[AZURE OPENAI MOCK RESPONSE] {prompt}"
+
+
+NEGATIVE_WORDS = {"down", "outage", "error", "fail", "failed", "broken", "slow", "angry", "bad"}
+RISK_WORDS = {"password", "secret", "token", "delete", "drop", "breach", "leak"}
+
+
+def analyze_sentiment(text: str) -> dict:
+    """
+    Mock Azure AI Language sentiment for demo purposes
+    """
+    words = set(text.lower().split())
+    negative = len(words & NEGATIVE_WORDS)
+    label = "negative" if negative else "neutral"
+    return {"label": label, "score": min(1.0, 0.5 + 0.25 * negative) if negative else 0.5}
+
+
+def detect_risk(text: str) -> dict:
+    """
+    Mock Azure content risk detection for demo purposes
+    """
+    hits = sorted(set(text.lower().split()) & RISK_WORDS)
+    return {"level": "high" if hits else "low", "matches": hits}
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+
+from backend.core.database import Base
+
+
+class ApiKey(Base):
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=True)
+
+    # sha256 of the key; the key itself is only shown once, at creation
+    key_hash = Column(String(64), nullable=False, unique=True, index=True)
+    prefix = Column(String(8), nullable=False)  # lets users tell keys apart
+
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from backend.core.database import Base
+
+
+class WorkerMember(Base):
+    __tablename__ = "worker_members"
+
+    id = Column(String, primary_key=True)  # hostname:pid
+    started_at = Column(DateTime, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ClusterLease(Base):
+    __tablename__ = "cluster_leases"
+
+    name = Column(String, primary_key=True)  # e.g. "scheduler"
+    holder = Column(String, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
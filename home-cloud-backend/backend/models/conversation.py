@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from backend.core.database import Base
+
+
+class ConversationMessage(Base):
+    __tablename__ = "conversation_messages"
+    __table_args__ = (
+        # History is read newest-first per (user, session)
+        Index("ix_conversation_messages_user_session_id", "user_id", "session_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    session_id = Column(String(64), nullable=False)
+
+    role = Column(String(16), nullable=False)  # "user" or "assistant"
+    content = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, UniqueConstraint
+from backend.core.database import Base
+
+
+# Resolved incident downtime per website per UTC day, summed by SLA queries
+class DailyDowntime(Base):
+    __tablename__ = "daily_downtime"
+    __table_args__ = (
+        UniqueConstraint("website_id", "day", name="uq_daily_downtime_website_day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    website_id = Column(Integer, ForeignKey("websites.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    downtime_seconds = Column(Float, default=0)
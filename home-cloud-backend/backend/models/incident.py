@@ -1,9 +1,15 @@
 from backend.core.database import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from datetime import datetime
 
 class Incident(Base):
     __tablename__ = "incidents"
+    __table_args__ = (
+        # Open incidents are looked up by (website_id, resolved_at IS NULL)
+        Index("ix_incidents_website_resolved_at", "website_id", "resolved_at"),
+        # Incident lists page newest-first on (started_at, id)
+        Index("ix_incidents_website_started_at", "website_id", "started_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     website_id = Column(Integer, ForeignKey("websites.id"))
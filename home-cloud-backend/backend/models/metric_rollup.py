@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, UniqueConstraint
+from backend.core.database import Base
+
+
+class MetricRollup(Base):
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        UniqueConstraint("website_id", "resolution", "bucket_start", name="uq_metric_rollups_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    website_id = Column(Integer, ForeignKey("websites.id"), nullable=False)
+    resolution = Column(String, nullable=False)  # 1m | 1h | 1d
+    bucket_start = Column(DateTime, nullable=False)
+
+    count = Column(Integer, default=0)
+    up_count = Column(Integer, default=0)
+    min_ms = Column(Float, nullable=True)
+    max_ms = Column(Float, nullable=True)
+    sum_ms = Column(Float, default=0)
+
+    sketch = Column(JSON, nullable=True)  # QuantileSketch.to_dict()
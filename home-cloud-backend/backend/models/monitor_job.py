@@ -1,14 +1,34 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from backend.core.database import Base
 from datetime import datetime
 
 class MonitorJob(Base):
     __tablename__ = "monitor_jobs"
+    __table_args__ = (
+        # Claim query: WHERE status = ... ORDER BY created_at
+        Index("ix_monitor_jobs_status_created_at", "status", "created_at"),
+        # At most one pending job per website; enqueueing coalesces on it
+        Index(
+            "uq_monitor_jobs_pending_website",
+            "website_id",
+            unique=True,
+            sqlite_where=text("status = 'pending'"),
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     website_id = Column(Integer, ForeignKey("websites.id"), nullable=False)
-    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=True)
 
-    status = Column(String, default="pending")  
+    status = Column(String, default="pending")  # pending | running | done
     created_at = Column(DateTime, default=datetime.utcnow)
     executed_at = Column(DateTime, nullable=True)
+
+    # Cluster member whose shard the website hashes to
+    owner = Column(String, nullable=True)
+
+    # Lease held by the worker that claimed the job; expired leases are reclaimed
+    leased_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)
@@ -1,19 +1,22 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
 from datetime import datetime
 import uuid
 
-from core.database import Base
+from backend.core.database import Base
 
 
 class MonitoringResult(Base):
     __tablename__ = "monitoring_results"
+    __table_args__ = (
+        Index("ix_monitoring_results_website_checked_at", "website_id", "checked_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    website_id = Column(String, ForeignKey("websites.id"), nullable=False)
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False)
+    website_id = Column(Integer, ForeignKey("websites.id"), nullable=False)
+    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=True)
 
     status_code = Column(Integer)
     response_time_ms = Column(Float)
-    error_type = Column(String)  # DNS, NETWORK, TIMEOUT, HTTP_ERROR, NONE
+    error_type = Column(String)  # FailureType value: UP, DNS_FAILURE, TIMEOUT, ...
 
     checked_at = Column(DateTime, default=datetime.utcnow)
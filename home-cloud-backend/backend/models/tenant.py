@@ -3,7 +3,7 @@ from sqlalchemy.dialects.sqlite import BLOB
 from datetime import datetime
 import uuid
 
-from core.database import Base
+from backend.core.database import Base
 
 
 class Tenant(Base):
@@ -2,7 +2,7 @@ from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
 from datetime import datetime
 import uuid
 
-from core.database import Base
+from backend.core.database import Base
 
 
 class User(Base):
@@ -1,14 +1,24 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from datetime import datetime
+import secrets
 from backend.core.database import Base
 
 class Website(Base):
     __tablename__ = "websites"
+    __table_args__ = (
+        # Tenant website lists page on id
+        Index("ix_websites_tenant_active_id", "tenant_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, nullable=False)
     interval = Column(Integer, default=60)
 
+    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=True, index=True)
+
+    # Unguessable id for the public status page
+    public_token = Column(String, unique=True, index=True, nullable=True, default=lambda: secrets.token_urlsafe(16))
+
     last_status = Column(String, default="UNKNOWN")
     last_checked = Column(DateTime, nullable=True)
 
@@ -0,0 +1,32 @@
+"""
+Run monitoring as its own process, so probe load never competes with API
+requests:
+
+    MONITOR_MODE=external uvicorn backend.app:app ...
+    python -m backend.monitor
+"""
+import signal
+import logging
+from backend.core.schema import create_schema
+from backend.models.tenant import Tenant
+from backend.models.user import User
+from backend.monitor.runtime import runtime
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    create_schema()
+
+    def shutdown(signum, frame):
+        runtime.request_stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    runtime.start()
+    runtime.wait()
+    runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
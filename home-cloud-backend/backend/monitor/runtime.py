@@ -0,0 +1,108 @@
+import os
+import time
+import socket
+import logging
+import threading
+from backend.services.scheduler import scheduler, scheduler_loop
+from backend.services.worker_loop import worker_loop
+from backend.services.job_queue import compactor_loop
+from backend.services.rollup_service import retention_loop
+from backend.services.result_writer import result_writer
+from backend.services.incident_tracker import incident_tracker
+from backend.services.alert_queue import alert_queue
+from backend.services.probe_engine import close_probe_engine
+from backend.services.probe_pool import probe_pool, PROBE_PROCESSES
+from backend.services import webhook_service
+from backend.services.cluster import Cluster, cluster_loop
+from backend.core.database import SessionLocal
+
+# inprocess: the API process runs monitoring; external: `python -m backend.monitor`
+MONITOR_MODE = os.getenv("MONITOR_MODE", "inprocess")
+MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", 2))
+
+logger = logging.getLogger(__name__)
+
+
+class MonitoringRuntime:
+    """
+    The one place monitoring runs: cluster membership, the due-time
+    scheduler, the probe workers, the result writer (which drives incidents
+    and alerts) and the housekeeping loops. Several runtimes (processes or
+    nodes) can share one database; websites are sharded between them.
+    start() and stop() are idempotent; stop() lets in-flight batches
+    finish, flushes buffered results and drains alerts.
+    """
+
+    def __init__(self, workers: int = MONITOR_WORKERS):
+        self.workers = workers
+        self.member_id = f"{socket.gethostname()}:{os.getpid()}"
+        # Sites that moved in from another member need fresh incident state
+        self.cluster = Cluster(self.member_id, on_change=incident_tracker.invalidate)
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def _spawn(self, name, target, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def start(self):
+        if self.running:
+            return
+
+        logger.info("Starting monitoring runtime %s with %d workers", self.member_id, self.workers)
+        self._stop.clear()
+        result_writer.start()
+        alert_queue.start()
+        if PROBE_PROCESSES > 0:
+            probe_pool.start()
+
+        # Join the cluster before scheduling so leadership is known up front
+        db = SessionLocal()
+        try:
+            self.cluster.tick(db)
+        finally:
+            db.close()
+
+        self._spawn("cluster", cluster_loop, self.cluster, self._stop)
+        self._spawn("scheduler", scheduler_loop, self._stop, self.cluster)
+        for i in range(self.workers):
+            self._spawn(f"probe-worker-{i}", worker_loop, f"{self.member_id}:{i}", self._stop, self.cluster)
+        self._spawn("job-compactor", compactor_loop, self._stop)
+        self._spawn("rollup-retention", retention_loop, self._stop)
+
+    def request_stop(self):
+        self._stop.set()
+        scheduler.wake()
+
+    def stop(self, timeout: float = 30):
+        """Signal every loop at once, then wait for them all within one `timeout`."""
+        if not self.running:
+            return
+
+        logger.info("Stopping monitoring runtime %s", self.member_id)
+        self.request_stop()
+
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        stuck = [thread.name for thread in self._threads if thread.is_alive()]
+        if stuck:
+            logger.warning("Monitoring threads still running after %ss: %s", timeout, ", ".join(stuck))
+        self._threads = []
+
+        probe_pool.stop()
+        result_writer.stop()
+        alert_queue.stop()
+        close_probe_engine()
+        webhook_service.close()
+
+    def wait(self):
+        self._stop.wait()
+
+
+runtime = MonitoringRuntime()
@@ -1,13 +1,81 @@
-from fastapi import APIRouter, HTTPException
-from backend.services.ollama_service import generate_response
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.core.llm.scheduler import llm_scheduler, LLMBusy, LLMQueueTimeout
+from backend.core.llm.llm_router import generate_reply
+from backend.auth.deps import get_current_user
+from backend.auth.cache import Principal
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
+logger = logging.getLogger(__name__)
+
+
+class _LeasedStreamingResponse(StreamingResponse):
+    """Releases the LLM slot even if the body never starts (early disconnect)."""
+
+    def __init__(self, content, lease, **kwargs):
+        super().__init__(content, **kwargs)
+        self.lease = lease
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.lease.release()
+
+
+def _busy():
+    return HTTPException(
+        status_code=429,
+        detail="The assistant is busy, retry shortly",
+        headers={"Retry-After": "2"},
+    )
+
 
 @router.post("/chat")
-def chat(prompt: str):
+async def chat(prompt: str, current_user: Principal = Depends(get_current_user)):
     try:
-        reply = generate_response(prompt)
+        reply = await generate_reply(prompt)
         return {"response": reply}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    except LLMBusy:
+        raise _busy()
+    except LLMQueueTimeout:
+        raise HTTPException(status_code=503, detail="Timed out waiting for the assistant")
+    except Exception:
+        logger.exception("Assistant generation failed")
+        raise HTTPException(status_code=500, detail="The assistant failed to answer")
+
+
+@router.post("/chat/stream")
+async def chat_stream(prompt: str, current_user: Principal = Depends(get_current_user)):
+    """
+    Server-Sent Events variant of /ai/chat: one `data: {"token": ...}`
+    event per generated chunk, then `event: done` (or `event: error`).
+    Disconnecting stops the generation upstream.
+    """
+    # Queue for a slot before the response starts, so 429/503 can still be sent
+    try:
+        lease = await llm_scheduler.acquire()
+    except LLMBusy:
+        raise _busy()
+    except LLMQueueTimeout:
+        raise HTTPException(status_code=503, detail="Timed out waiting for the assistant")
+
+    async def events():
+        try:
+            async for token in llm_scheduler.stream(prompt, lease=lease):
+                yield f"data: {json.dumps({'token': token})}\n\n"
+        except Exception:
+            logger.exception("Assistant stream failed")
+            yield f"event: error\ndata: {json.dumps({'detail': 'The assistant failed to answer'})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return _LeasedStreamingResponse(
+        events(),
+        lease,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,81 @@
+import json
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from backend.core.llm.scheduler import llm_scheduler, LLMBusy, LLMQueueTimeout
+from backend.core.llm.llm_router import generate_reply
+from backend.core.retrieval.document_index import document_index
+from backend.routes.ai_routes import _LeasedStreamingResponse, _busy
+from backend.auth.deps import get_current_user
+from backend.auth.cache import Principal
+
+router = APIRouter(tags=["AI"])
+
+logger = logging.getLogger(__name__)
+
+
+class AskRequest(BaseModel):
+    question: str
+    top_k: int = Field(3, ge=1, le=20)
+    stream: bool = False
+
+
+def _grounded_prompt(question, hits):
+    if not hits:
+        return question
+    context = "\n\n".join(f"[{n}] ({source}) {text}" for n, (_, source, text) in enumerate(hits, 1))
+    return (
+        "Answer the question using the numbered excerpts below. "
+        "If they don't contain the answer, say so.\n\n"
+        f"{context}\n\nQuestion: {question}\nAnswer:"
+    )
+
+
+@router.post("/ask")
+async def ask(request: AskRequest, current_user: Principal = Depends(get_current_user)):
+    """
+    Answer `question` from the top_k most relevant chunks of documents/.
+    With stream=true the answer is sent as Server-Sent Events, like
+    /ai/chat/stream, preceded by an `event: sources` event.
+    """
+    hits = await asyncio.to_thread(document_index.search, request.question, request.top_k)
+    prompt = _grounded_prompt(request.question, hits)
+    sources = [{"source": source, "score": round(score, 4)} for score, source, _ in hits]
+
+    if not request.stream:
+        try:
+            answer = await generate_reply(prompt)
+        except LLMBusy:
+            raise _busy()
+        except LLMQueueTimeout:
+            raise HTTPException(status_code=503, detail="Timed out waiting for the assistant")
+        except Exception:
+            logger.exception("Assistant generation failed")
+            raise HTTPException(status_code=500, detail="The assistant failed to answer")
+        return {"answer": answer, "sources": sources}
+
+    try:
+        lease = await llm_scheduler.acquire()
+    except LLMBusy:
+        raise _busy()
+    except LLMQueueTimeout:
+        raise HTTPException(status_code=503, detail="Timed out waiting for the assistant")
+
+    async def events():
+        yield f"event: sources\ndata: {json.dumps(sources)}\n\n"
+        try:
+            async for token in llm_scheduler.stream(prompt, lease=lease):
+                yield f"data: {json.dumps({'token': token})}\n\n"
+        except Exception:
+            logger.exception("Assistant stream failed")
+            yield f"event: error\ndata: {json.dumps({'detail': 'The assistant failed to answer'})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return _LeasedStreamingResponse(
+        events(),
+        lease,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
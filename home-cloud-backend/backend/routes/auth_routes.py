@@ -1,39 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from backend.core.database import get_db
 from backend.models.user import User
 from backend.models.tenant import Tenant
-from backend.auth.security import hash_password, verify_password, create_access_token
+from backend.models.api_key import ApiKey
+from backend.auth.security import password_hasher, PasswordPoolBusy, create_access_token
+from backend.auth.deps import get_current_user
+from backend.core.security import generate_api_key, hash_api_key
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 @router.post("/register")
-def register(email: str, password: str, tenant_name: str, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
+async def register(email: str, password: str, tenant_name: str, db: Session = Depends(get_db)):
+    hashed_password = await _password_work(password_hasher.hash(password))
 
-    tenant = db.query(Tenant).filter(Tenant.name == tenant_name).first()
-    if not tenant:
-        tenant = Tenant(name=tenant_name)
-        db.add(tenant)
-        db.commit()
-        db.refresh(tenant)
+    def create():
+        tenant_id = db.query(Tenant.id).filter(Tenant.name == tenant_name).scalar()
+        if tenant_id is None:
+            tenant = Tenant(name=tenant_name)
+            db.add(tenant)
+            db.flush()
+            tenant_id = tenant.id
 
-    user = User(
-        email=email,
-        hashed_password=hash_password(password),
-        tenant_id=tenant.id,
-    )
+        db.add(User(email=email, hashed_password=hashed_password, tenant_id=tenant_id))
+        db.commit()
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # The unique index on email does the duplicate check in the same round trip
+    try:
+        await run_in_threadpool(create)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
 
     return {"message": "User registered successfully"}
+
+
 @router.post("/login")
-def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def login(email: str, password: str, db: Session = Depends(get_db)):
+    def lookup():
+        try:
+            return (
+                db.query(User.id, User.tenant_id, User.hashed_password, User.is_active)
+                .filter(User.email == email)
+                .first()
+            )
+        finally:
+            # Don't hold a pooled connection while bcrypt runs
+            db.close()
+
+    user = await run_in_threadpool(lookup)
+    if not user or user.is_active is False:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if not await _password_work(password_hasher.verify(password, user.hashed_password)):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token({"sub": user.id, "tenant_id": user.tenant_id})
@@ -42,3 +63,55 @@ def login(email: str, password: str, db: Session = Depends(get_db)):
         "access_token": token,
         "token_type": "bearer",
     }
+
+
+async def _password_work(coro):
+    try:
+        return await coro
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many authentication requests, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+@router.post("/api-keys")
+def create_api_key(name: str = None, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    key = generate_api_key()
+    api_key = ApiKey(
+        user_id=current_user.id,
+        name=name,
+        key_hash=hash_api_key(key),
+        prefix=key[:8],
+    )
+    db.add(api_key)
+    db.commit()
+    db.refresh(api_key)
+
+    # The key is never stored; this is the only time it is returned
+    return {"id": api_key.id, "name": api_key.name, "key": key}
+
+
+@router.get("/api-keys")
+def list_api_keys(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    keys = db.query(ApiKey).filter(ApiKey.user_id == current_user.id).order_by(ApiKey.id).all()
+    return [
+        {"id": k.id, "name": k.name, "prefix": k.prefix, "created_at": k.created_at}
+        for k in keys
+    ]
+
+
+@router.delete("/api-keys/{key_id}")
+def revoke_api_key(key_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    api_key = (
+        db.query(ApiKey)
+        .filter(ApiKey.id == key_id, ApiKey.user_id == current_user.id)
+        .first()
+    )
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+
+    db.delete(api_key)
+    db.commit()
+    return {"message": "API key revoked"}
@@ -1,44 +1,168 @@
+import io
 import csv
-from fastapi import APIRouter, Depends, Response
+import zlib
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from backend.core.auth import get_current_user
 from backend.core.database import SessionLocal
 from backend.models.incident import Incident
 from backend.models.website import Website
+from backend.models.monitoring_result import MonitoringResult
+
+EXPORT_BATCH = 2000  # rows fetched per round trip and encoded per chunk
 
 router = APIRouter(prefix="/api/export", tags=["Export"])
 
+
+def _csv_stream(db, stmt, header, gzip: bool):
+    """
+    Encode rows of `stmt` as CSV chunks while they are fetched. yield_per
+    makes the driver use a server-side cursor (Postgres) so only one batch
+    is in memory; the session stays open until the stream ends.
+    """
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31 = gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    try:
+        writer.writerow(header)
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH))
+        for rows in result.partitions():
+            writer.writerows(rows)
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+        tail = drain()
+        if compressor:
+            tail += compressor.flush()
+        if tail:
+            yield tail
+    finally:
+        db.close()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """gzip (or *) listed in Accept-Encoding with a non-zero q-value."""
+    q_values = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_values[coding] = q
+    return q_values.get("gzip", q_values.get("*", 0.0)) > 0
+
+
+def _csv_response(request: Request, db, stmt, header, filename):
+    gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return StreamingResponse(
+        _csv_stream(db, stmt, header, gzip),
+        media_type="text/csv",
+        headers=headers,
+    )
+
+
+def _owned_website(db, website_id, user):
+    website = (
+        db.query(Website.id)
+        .filter(
+            Website.id == website_id,
+            Website.tenant_id == user.tenant_id,
+        )
+        .first()
+    )
+    if not website:
+        raise HTTPException(status_code=404, detail="Website not found")
+
+
 @router.get("/incidents/{website_id}")
-def export_incidents(website_id: int, user=Depends(get_current_user)):
+def export_incidents(
+    website_id: int,
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user=Depends(get_current_user),
+):
+    # Not get_db: the session must outlive the handler and close with the stream
     db = SessionLocal()
     try:
-        website = (
-            db.query(Website)
-            .filter(
-                Website.id == website_id,
-                Website.organization_id == user.organization_id
-            )
-            .first()
+        _owned_website(db, website_id, user)
+
+        stmt = (
+            select(Incident.started_at, Incident.resolved_at, Incident.reason)
+            .where(Incident.website_id == website_id)
+            .order_by(Incident.started_at)
+        )
+        if start is not None:
+            stmt = stmt.where(Incident.started_at >= start)
+        if end is not None:
+            stmt = stmt.where(Incident.started_at < end)
+
+        return _csv_response(
+            request, db, stmt,
+            ["started_at", "resolved_at", "reason"],
+            f"incidents-{website_id}.csv",
         )
-        if not website:
-            return {"error": "Website not found"}
+    except Exception:
+        db.close()  # the stream never started, so it won't close it
+        raise
 
-        incidents = (
-            db.query(Incident)
-            .filter(Incident.website_id == website_id)
-            .all()
+
+@router.get("/results/{website_id}")
+def export_results(
+    website_id: int,
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    user=Depends(get_current_user),
+):
+    """Raw check history, oldest first; streams at constant memory."""
+    db = SessionLocal()
+    try:
+        _owned_website(db, website_id, user)
+
+        stmt = (
+            select(
+                MonitoringResult.checked_at,
+                MonitoringResult.status_code,
+                MonitoringResult.response_time_ms,
+                MonitoringResult.error_type,
+            )
+            .where(MonitoringResult.website_id == website_id)
+            .order_by(MonitoringResult.checked_at)
         )
+        if start is not None:
+            stmt = stmt.where(MonitoringResult.checked_at >= start)
+        if end is not None:
+            stmt = stmt.where(MonitoringResult.checked_at < end)
 
-        def generate():
-            yield "started_at,resolved_at,reason\n"
-            for i in incidents:
-                yield f"{i.started_at},{i.resolved_at},{i.reason}\n"
-
-        return Response(
-            generate(),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": "attachment; filename=incidents.csv"
-            },
+        return _csv_response(
+            request, db, stmt,
+            ["checked_at", "status_code", "response_time_ms", "error_type"],
+            f"results-{website_id}.csv",
         )
-    finally:
-        db.close()
+    except Exception:
+        db.close()  # the stream never started, so it won't close it
+        raise
@@ -1,21 +1,45 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
 from backend.core.auth import get_current_user
-from backend.core.database import SessionLocal
+from backend.core.database import get_db
 from backend.models.incident import Incident
 from backend.models.website import Website
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, select_columns, paginate
 
 router = APIRouter(prefix="/api/incidents", tags=["Incidents"])
 
 @router.get("/")
-def list_incidents(user=Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        return (
-            db.query(Incident)
-            .join(Website)
-            .filter(Website.organization_id == user.organization_id)
-            .order_by(Incident.started_at.desc())
-            .all()
-        )
-    finally:
-        db.close()
+def list_incidents(
+    response: Response,
+    website_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Incidents of the tenant, newest first, paged on (started_at, id).
+    The next page's cursor is in the X-Next-Cursor header.
+    """
+    query = (
+        db.query(*select_columns(Incident, fields, required=("id", "started_at")))
+        .join(Website, Website.id == Incident.website_id)
+        .filter(Website.tenant_id == user.tenant_id)
+    )
+    if website_id is not None:
+        query = query.filter(Incident.website_id == website_id)
+
+    if cursor:
+        started_at, last_id = decode_cursor(cursor, datetime, int)
+        query = query.filter(tuple_(Incident.started_at, Incident.id) < (started_at, last_id))
+
+    rows = (
+        query.order_by(Incident.started_at.desc(), Incident.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    return paginate(response, rows, limit, lambda row: [row.started_at, row.id])
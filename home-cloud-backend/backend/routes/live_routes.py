@@ -0,0 +1,140 @@
+import json
+import asyncio
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from backend.core.database import get_db
+from backend.models.website import Website
+from backend.models.incident import Incident
+from backend.auth.deps import get_stream_user
+from backend.services.live_events import live_events
+
+LIVE_HEARTBEAT = 15  # seconds between keep-alive comments
+
+router = APIRouter(prefix="/api/live", tags=["Live"])
+
+
+class _SubscribedStreamingResponse(StreamingResponse):
+    """Unsubscribes even if the body never starts (early disconnect)."""
+
+    def __init__(self, content, tenant_id, sub, **kwargs):
+        super().__init__(content, **kwargs)
+        self.tenant_id = tenant_id
+        self.sub = sub
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            live_events.unsubscribe(self.tenant_id, self.sub)
+
+
+def _sse(event_id, kind, data) -> str:
+    return f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _snapshot(db: Session, tenant_id) -> dict:
+    try:
+        websites = (
+            db.query(
+                Website.id, Website.url, Website.interval, Website.last_status,
+                Website.failure_type, Website.response_time_ms, Website.last_checked,
+            )
+            .filter(Website.tenant_id == tenant_id, Website.is_active == True)
+            .all()
+        )
+        open_incidents = {
+            website_id
+            for (website_id,) in db.query(Incident.website_id)
+            .join(Website, Website.id == Incident.website_id)
+            .filter(Website.tenant_id == tenant_id, Incident.resolved_at.is_(None))
+        }
+    finally:
+        db.close()
+
+    return {
+        "websites": [
+            {
+                "id": w.id,
+                "url": w.url,
+                "interval": w.interval,
+                "status": w.last_status,
+                "failure_type": w.failure_type,
+                "response_time_ms": w.response_time_ms,
+                "last_checked": w.last_checked.isoformat() if w.last_checked else None,
+                "incident_open": w.id in open_incidents,
+            }
+            for w in websites
+        ],
+    }
+
+
+@router.get("/stream")
+async def live_stream(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_stream_user),
+):
+    """
+    Server-Sent Events of the tenant's website changes.
+
+    A new client gets one `snapshot` event with every active website, then
+    `site`, `incident`, `site_added` and `site_removed` deltas. A client
+    reconnecting with Last-Event-ID gets the deltas it missed instead,
+    or a fresh snapshot if they are no longer buffered.
+    """
+    tenant_id = current_user.tenant_id
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+
+    # Subscribe first so nothing published during the snapshot is missed
+    sub = live_events.subscribe(tenant_id)
+
+    try:
+        backlog = None
+        if last_event_id and last_event_id.isdigit():
+            backlog = live_events.replay(tenant_id, int(last_event_id))
+
+        if backlog is None:
+            snapshot_id = live_events.last_id
+            snapshot = await run_in_threadpool(_snapshot, db, tenant_id)
+        else:
+            db.close()
+    except BaseException:
+        live_events.unsubscribe(tenant_id, sub)  # no response will own it
+        raise
+
+    async def events():
+        if backlog is None:
+            yield _sse(snapshot_id, "snapshot", snapshot)
+            sent = snapshot_id
+        else:
+            sent = int(last_event_id)
+            for event in backlog:
+                yield _sse(event.id, event.kind, event.data)
+                sent = event.id
+
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), LIVE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                return  # fell behind; the client reconnects with Last-Event-ID
+            if event.id <= sent:
+                continue  # already covered by the snapshot or backlog
+            yield _sse(event.id, event.kind, event.data)
+            sent = event.id
+
+    return _SubscribedStreamingResponse(
+        events(),
+        tenant_id,
+        sub,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,31 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
 from backend.core.auth import get_current_user
 from backend.core.database import SessionLocal
-from backend.services.sla_service import calculate_uptime
+from backend.services.sla_service import calculate_uptime, calculate_tenant_uptime
 from backend.models.website import Website
 
 router = APIRouter(prefix="/api/sla", tags=["SLA"])
 
+
+def _check_range(start: datetime, end: datetime):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+
+@router.get("/")
+def get_tenant_sla(
+    start: datetime,
+    end: datetime,
+    user=Depends(get_current_user),
+):
+    _check_range(start, end)
+    db = SessionLocal()
+    try:
+        return calculate_tenant_uptime(db, user.tenant_id, start, end)
+    finally:
+        db.close()
+
 @router.get("/{website_id}")
 def get_sla(
     website_id: int,
@@ -14,13 +33,14 @@ def get_sla(
     end: datetime,
     user=Depends(get_current_user),
 ):
+    _check_range(start, end)
     db = SessionLocal()
     try:
         website = (
             db.query(Website)
             .filter(
                 Website.id == website_id,
-                Website.organization_id == user.organization_id
+                Website.tenant_id == user.tenant_id
             )
             .first()
         )
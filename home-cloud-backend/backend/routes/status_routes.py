@@ -1,24 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from backend.core.database import SessionLocal
+from backend.core.metrics import metrics
 from backend.models.website import Website
+from backend.services.status_cache import status_cache, render_status, STATUS_MAX_AGE
 
 router = APIRouter(prefix="/status", tags=["Public Status"])
 
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match is `*` or a comma-separated list of (possibly weak) tags."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @router.get("/{token}")
-def public_status(token: str):
-    db = SessionLocal()
-    website = (
-        db.query(Website)
-        .filter(Website.public_token == token)
-        .first()
-    )
-    db.close()
-
-    if not website:
+def public_status(token: str, request: Request):
+    page = status_cache.get(token)
+
+    if page is None:
+        db = SessionLocal()
+        try:
+            website = (
+                db.query(Website.id, Website.url, Website.last_status, Website.last_checked)
+                .filter(Website.public_token == token, Website.is_active == True)
+                .first()
+            )
+        finally:
+            db.close()
+
+        if website:
+            page = status_cache.put(token, website.id, render_status(website))
+        else:
+            page = status_cache.put(token, None, None)
+
+    if page.payload is None:
         raise HTTPException(status_code=404, detail="Status page not found")
 
-    return {
-        "url": website.url,
-        "status": website.status,
-        "last_checked": website.last_checked,
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": f"public, max-age={STATUS_MAX_AGE}",
     }
+
+    if _etag_matches(request.headers.get("if-none-match", ""), page.etag):
+        metrics.inc("status_not_modified_total")
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=page.body, media_type="application/json", headers=headers)
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from backend.core.database import get_db
 from backend.models.website import Website
 from backend.auth.deps import get_current_user
+from backend.services.scheduler import scheduler, MIN_INTERVAL
+from backend.services.status_cache import status_cache
+from backend.services.live_events import live_events, live_publisher
+from backend.services.rollup_service import get_series, RESOLUTIONS
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, select_columns, paginate
 router = APIRouter(tags=["Websites"])
 @router.post("/")
 def register_website(
@@ -22,27 +28,48 @@ def register_website(
     db.commit()
     db.refresh(website)
 
+    scheduler.schedule(website.id, website.interval, website.tenant_id, due_now=True)
+    live_events.publish(website.tenant_id, "site_added", {
+        "id": website.id,
+        "url": website.url,
+        "interval": website.interval,
+        "status": website.last_status,
+    })
+
     return {
         "id": website.id,
         "url": website.url,
         "interval": website.interval,
+        "public_token": website.public_token,
         "status": "registered",
     }
 @router.get("/")
 def list_websites(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
-    websites = (
-        db.query(Website)
+    """
+    Active websites of the tenant by id. The next page's cursor is in the
+    X-Next-Cursor header; `fields=id,url,last_status` limits the columns.
+    """
+    query = (
+        db.query(*select_columns(Website, fields))
         .filter(
             Website.tenant_id == current_user.tenant_id,
             Website.is_active == True,
         )
-        .all()
     )
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.filter(Website.id > last_id)
+
+    rows = query.order_by(Website.id).limit(limit + 1).all()
 
-    return websites
+    return paginate(response, rows, limit, lambda row: [row.id])
 @router.delete("/{website_id}")
 def deactivate_website(
     website_id: int,
@@ -64,4 +91,69 @@ def deactivate_website(
     website.is_active = False
     db.commit()
 
+    scheduler.remove(website.id)
+    status_cache.invalidate_website(website.id)
+    live_publisher.forget(website.id)
+    live_events.publish(website.tenant_id, "site_removed", {"id": website.id})
+
     return {"message": "Website monitoring disabled"}
+
+
+@router.patch("/{website_id}")
+def update_interval(
+    website_id: int,
+    interval: int = Query(..., ge=MIN_INTERVAL),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    website = (
+        db.query(Website)
+        .filter(
+            Website.id == website_id,
+            Website.tenant_id == current_user.tenant_id,
+        )
+        .first()
+    )
+
+    if not website:
+        raise HTTPException(status_code=404, detail="Website not found")
+
+    website.interval = interval
+    db.commit()
+
+    if website.is_active:
+        scheduler.schedule(website.id, website.interval, website.tenant_id)
+
+    return {
+        "id": website.id,
+        "url": website.url,
+        "interval": website.interval,
+    }
+@router.get("/{website_id}/metrics")
+def website_metrics(
+    website_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: str | None = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    website = (
+        db.query(Website.id)
+        .filter(
+            Website.id == website_id,
+            Website.tenant_id == current_user.tenant_id,
+        )
+        .first()
+    )
+
+    if not website:
+        raise HTTPException(status_code=404, detail="Website not found")
+
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail="resolution must be one of 1m, 1h, 1d")
+
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+
+    return get_series(db, website_id, start, end, resolution)
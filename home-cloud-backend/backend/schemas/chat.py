@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: str = Field("default", max_length=64)
 
 class ChatResponse(BaseModel):
     reply: str
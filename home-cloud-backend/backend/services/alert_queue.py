@@ -0,0 +1,155 @@
+import os
+import time
+import heapq
+import queue
+import logging
+import itertools
+import threading
+from backend.services.email_service import send_email
+from backend.services.webhook_service import send_slack, send_webhook
+
+ALERT_COALESCE_WINDOW = float(os.getenv("ALERT_COALESCE_WINDOW", 5))  # seconds
+ALERT_MAX_ATTEMPTS = int(os.getenv("ALERT_MAX_ATTEMPTS", 5))
+ALERT_RETRY_BASE = 2  # seconds, doubled per failed attempt
+
+logger = logging.getLogger(__name__)
+
+
+class AlertMessage:
+    __slots__ = ("channel", "target", "subject", "body", "attempts")
+
+    def __init__(self, channel, target, subject, body, attempts=0):
+        self.channel = channel
+        self.target = target
+        self.subject = subject
+        self.body = body
+        self.attempts = attempts
+
+
+def build_digest(messages):
+    if len(messages) == 1:
+        return messages[0].subject, messages[0].body
+
+    subject = f"{len(messages)} website alerts"
+    body = "\n\n".join(f"{m.subject}\n{m.body}" for m in messages)
+    return subject, body
+
+
+class AlertQueue:
+    """
+    Outbound alert queue drained by one background thread, so monitoring
+    never waits on SMTP or webhooks.
+
+    Messages arriving within `coalesce_window` of each other are grouped by
+    (channel, target) and sent as one digest. A failed send is retried with
+    exponential backoff up to `max_attempts` times.
+    """
+
+    def __init__(self, coalesce_window: float = ALERT_COALESCE_WINDOW, max_attempts: int = ALERT_MAX_ATTEMPTS):
+        self.coalesce_window = coalesce_window
+        self.max_attempts = max_attempts
+        self._queue = queue.Queue()
+        self._retries = []  # heap of (ready_at, seq, AlertMessage)
+        self._seq = itertools.count()
+        self._senders = {
+            "email": send_email,
+            "slack": send_slack,
+            "whatsapp": send_webhook,  # via a WhatsApp gateway webhook
+            "webhook": send_webhook,
+        }
+        self._thread = None
+        self._running = False
+
+    def register_sender(self, channel: str, sender):
+        """sender(target, subject, body); raises on failure."""
+        self._senders[channel] = sender
+
+    def put(self, channel: str, target: str, subject: str, body: str):
+        if not self._running:
+            self.start()
+        self._queue.put(AlertMessage(channel, target, subject, body))
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="alert-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _due_retries(self, now):
+        due = []
+        while self._retries and self._retries[0][0] <= now:
+            due.append(heapq.heappop(self._retries)[2])
+        return due
+
+    def _collect(self):
+        # Block until the first message, or until the next retry is due
+        timeout = None
+        if self._retries:
+            timeout = max(self._retries[0][0] - time.monotonic(), 0)
+
+        batch = []
+        try:
+            first = self._queue.get(timeout=timeout)
+            if first is not None:
+                batch.append(first)
+        except queue.Empty:
+            pass
+
+        # Keep draining for the coalescing window so a burst becomes a digest
+        if batch:
+            deadline = time.monotonic() + self.coalesce_window
+            while self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if message is None:
+                    break
+                batch.append(message)
+
+        batch.extend(self._due_retries(time.monotonic()))
+        return batch
+
+    def _run(self):
+        while self._running or not self._queue.empty():
+            batch = self._collect()
+
+            groups = {}
+            for message in batch:
+                groups.setdefault((message.channel, message.target), []).append(message)
+
+            for (channel, target), messages in groups.items():
+                self._deliver(channel, target, messages)
+
+    def _deliver(self, channel, target, messages):
+        sender = self._senders.get(channel)
+        if sender is None:
+            logger.warning("No sender for alert channel %s, dropping %d alerts", channel, len(messages))
+            return
+
+        subject, body = build_digest(messages)
+        try:
+            sender(target, subject, body)
+        except Exception:
+            logger.exception("Alert delivery to %s via %s failed", target, channel)
+            for message in messages:
+                message.attempts += 1
+                if message.attempts >= self.max_attempts:
+                    logger.error("Giving up on alert to %s: %s", target, message.subject)
+                    continue
+                ready_at = time.monotonic() + ALERT_RETRY_BASE * 2 ** (message.attempts - 1)
+                heapq.heappush(self._retries, (ready_at, next(self._seq), message))
+
+
+alert_queue = AlertQueue()
@@ -1,20 +1,75 @@
+from sqlalchemy import update
 from backend.models.alert import Alert
-from backend.services.email_service import send_email
-
-def dispatch_alerts(db, website, message):
-    alerts = (
-        db.query(Alert)
-        .filter(
-            Alert.website_id == website.id,
-            Alert.enabled == True
+from backend.models.website import Website
+from backend.services.alert_queue import alert_queue
+from backend.services.alert_suppression import alert_suppressor
+
+def _transition_message(url, t):
+    if t.kind == "open":
+        return f"{url} is DOWN ({t.reason}) since {t.at:%Y-%m-%d %H:%M:%S} UTC"
+    return f"{url} is back UP since {t.at:%Y-%m-%d %H:%M:%S} UTC"
+
+def record_alert_state(db, transitions):
+    """Flip Website.alert_sent for a batch of incident opens/resolves. The caller commits."""
+    if transitions:
+        db.execute(
+            update(Website),
+            [{"id": t.website_id, "alert_sent": t.kind == "open"} for t in transitions],
         )
+
+def notify_transitions(db, transitions):
+    """
+    Queue the alerts for a batch of incident opens/resolves, after dedup,
+    correlation and rate limiting. Two read queries for the whole batch;
+    delivery happens on the alert queue thread. Call only once the
+    transitions are committed, so a rolled-back batch never alerts.
+    """
+    if not transitions:
+        return
+
+    website_ids = {t.website_id for t in transitions}
+
+    transitions = alert_suppressor.deduplicate(transitions)
+    if not transitions:
+        return
+
+    urls = dict(
+        db.query(Website.id, Website.url)
+        .filter(Website.id.in_(website_ids))
         .all()
     )
 
-    for alert in alerts:
-        if alert.channel == "email":
-            send_email(
-                alert.target,
-                f"Website Alert: {website.url}",
-                message
-            )
+    alerts = {}
+    for alert in db.query(Alert).filter(
+        Alert.website_id.in_(website_ids),
+        Alert.enabled == True
+    ):
+        alerts.setdefault(alert.website_id, []).append(alert)
+
+    outgoing = []  # (tenant_id, channel, target, subject, body)
+
+    grouped, single = alert_suppressor.correlate(transitions)
+
+    for members in grouped:
+        first = members[0]
+        state = f"DOWN ({first.reason})" if first.kind == "open" else "back UP"
+        subject = f"{len(members)} websites {state}"
+        body = "\n".join(_transition_message(urls.get(t.website_id, t.website_id), t) for t in members)
+
+        # One notification per target, however many of its sites are in the group
+        targets = {
+            (alert.channel, alert.target)
+            for t in members
+            for alert in alerts.get(t.website_id, [])
+        }
+        for channel, target in targets:
+            outgoing.append((first.tenant_id, channel, target, subject, body))
+
+    for t in single:
+        url = urls.get(t.website_id, f"website {t.website_id}")
+        for alert in alerts.get(t.website_id, []):
+            outgoing.append((t.tenant_id, alert.channel, alert.target, f"Website Alert: {url}", _transition_message(url, t)))
+
+    for tenant_id, channel, target, subject, body in outgoing:
+        if alert_suppressor.allow(tenant_id, channel, target):
+            alert_queue.put(channel, target, subject, body)
@@ -0,0 +1,116 @@
+import os
+import time
+import threading
+
+ALERT_DEDUP_WINDOW = int(os.getenv("ALERT_DEDUP_WINDOW", 900))  # seconds
+ALERT_TENANT_RATE = float(os.getenv("ALERT_TENANT_RATE", 30))  # alerts per minute
+ALERT_TENANT_BURST = int(os.getenv("ALERT_TENANT_BURST", 60))
+ALERT_TARGET_RATE = float(os.getenv("ALERT_TARGET_RATE", 6))  # alerts per minute
+ALERT_TARGET_BURST = int(os.getenv("ALERT_TARGET_BURST", 10))
+ALERT_CORRELATION_MIN = int(os.getenv("ALERT_CORRELATION_MIN", 5))  # sites
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> bool:
+        """Top up for the time elapsed; True if a token is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return self.tokens >= 1
+
+
+class AlertSuppressor:
+    """
+    Sits between incident transitions and the alert queue.
+
+    - dedup: a transition repeating the last one sent for its site (same
+      kind and failure type) within the dedup window is dropped; a change
+      of state is always sent, so the last alert matches the site
+    - correlation: when many sites of a tenant fail the same way in one
+      batch (e.g. a DNS outage), send one grouped notification
+    - rate limits: token buckets per tenant and per (channel, target)
+    """
+
+    def __init__(
+        self,
+        dedup_window: int = ALERT_DEDUP_WINDOW,
+        correlation_min: int = ALERT_CORRELATION_MIN,
+    ):
+        self.dedup_window = dedup_window
+        self.correlation_min = correlation_min
+        self._last_sent = {}  # website_id -> (kind/reason, monotonic time)
+        self._tenant_buckets = {}
+        self._target_buckets = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def deduplicate(self, transitions) -> list:
+        now = time.monotonic()
+        kept = []
+
+        with self._lock:
+            for t in transitions:
+                key = t.reason if t.kind == "open" else "RESOLVED"
+                last = self._last_sent.get(t.website_id)
+                if last is not None and last[0] == key and now - last[1] < self.dedup_window:
+                    self.suppressed += 1
+                    continue
+                self._last_sent[t.website_id] = (key, now)
+                kept.append(t)
+
+            # Keep the dedup table bounded
+            if len(self._last_sent) > 100_000:
+                cutoff = now - self.dedup_window
+                self._last_sent = {k: v for k, v in self._last_sent.items() if v[1] >= cutoff}
+
+        return kept
+
+    def correlate(self, transitions):
+        """
+        Split transitions into (grouped, single): grouped is a list of
+        transition lists sharing (tenant, kind, reason) that are large
+        enough to be reported as one event.
+        """
+        groups = {}
+        for t in transitions:
+            groups.setdefault((t.tenant_id, t.kind, t.reason), []).append(t)
+
+        grouped, single = [], []
+        for members in groups.values():
+            if len(members) >= self.correlation_min:
+                grouped.append(members)
+            else:
+                single.extend(members)
+        return grouped, single
+
+    def allow(self, tenant_id, channel: str, target: str) -> bool:
+        now = time.monotonic()
+
+        with self._lock:
+            tenant_bucket = self._tenant_buckets.get(tenant_id)
+            if tenant_bucket is None:
+                tenant_bucket = self._tenant_buckets[tenant_id] = TokenBucket(ALERT_TENANT_RATE, ALERT_TENANT_BURST)
+
+            target_bucket = self._target_buckets.get((channel, target))
+            if target_bucket is None:
+                target_bucket = self._target_buckets[(channel, target)] = TokenBucket(ALERT_TARGET_RATE, ALERT_TARGET_BURST)
+
+            # Take from neither unless both have a token, so a tenant-level
+            # rejection doesn't use up the target's quota (or vice versa)
+            if target_bucket.refill(now) and tenant_bucket.refill(now):
+                target_bucket.tokens -= 1
+                tenant_bucket.tokens -= 1
+                return True
+
+            self.suppressed += 1
+            return False
+
+
+alert_suppressor = AlertSuppressor()
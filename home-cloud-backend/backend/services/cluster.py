@@ -0,0 +1,189 @@
+import os
+import bisect
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.core.database import SessionLocal
+from backend.models.cluster import WorkerMember, ClusterLease
+from backend.models.monitor_job import MonitorJob
+
+CLUSTER_HEARTBEAT = float(os.getenv("CLUSTER_HEARTBEAT", 5))  # seconds
+CLUSTER_MEMBER_TTL = float(os.getenv("CLUSTER_MEMBER_TTL", 15))  # seconds without heartbeat = gone
+CLUSTER_VNODES = 64  # ring points per member
+SCHEDULER_LEASE = "scheduler"
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring of cluster members. Each member owns CLUSTER_VNODES
+    points, so a join or leave only moves ~1/N of the websites.
+    """
+
+    def __init__(self, members=(), vnodes: int = CLUSTER_VNODES):
+        self.members = tuple(sorted(members))
+        points = sorted(
+            (_hash(f"{member}#{i}"), member)
+            for member in self.members
+            for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [m for _, m in points]
+
+    def owner(self, website_id: int):
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(str(website_id))) % len(self._hashes)
+        return self._owners[index]
+
+
+class Cluster:
+    """
+    Membership, sharding and leadership for monitoring processes sharing
+    one database. Every member heartbeats into worker_members; the live set
+    defines the hash ring that assigns websites (and their jobs) to
+    members. One member holds the "scheduler" lease and is the only one
+    enqueueing jobs; it also re-shards pending jobs when membership changes.
+    """
+
+    def __init__(self, member_id: str, on_change=None):
+        self.member_id = member_id
+        self.on_change = on_change  # called when the ring changes
+        self.ring = HashRing([member_id])
+        self.live_members = (member_id,)
+        self.is_leader = False
+        self._lock = threading.Lock()
+
+    def owner(self, website_id: int):
+        with self._lock:
+            return self.ring.owner(website_id)
+
+    def _insert(self, db: Session):
+        return pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+
+    def heartbeat(self, db: Session):
+        now = datetime.utcnow()
+        stmt = self._insert(db)(WorkerMember).values(id=self.member_id, started_at=now, heartbeat_at=now)
+        db.execute(stmt.on_conflict_do_update(index_elements=["id"], set_={"heartbeat_at": now}))
+        db.commit()
+
+    def refresh_members(self, db: Session) -> bool:
+        """Reload the live member set; returns True if the ring changed."""
+        cutoff = datetime.utcnow() - timedelta(seconds=CLUSTER_MEMBER_TTL)
+        live = tuple(sorted(
+            member_id
+            for (member_id,) in db.query(WorkerMember.id).filter(WorkerMember.heartbeat_at >= cutoff)
+        ))
+        if self.member_id not in live:
+            live = tuple(sorted(live + (self.member_id,)))
+
+        with self._lock:
+            if live == self.live_members:
+                return False
+            self.live_members = live
+            self.ring = HashRing(live)
+
+        logger.info("Cluster membership changed: %s", ", ".join(live))
+        if self.on_change is not None:
+            self.on_change()
+        return True
+
+    def acquire_leadership(self, db: Session) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=CLUSTER_MEMBER_TTL)
+
+        db.execute(
+            self._insert(db)(ClusterLease)
+            .values(name=SCHEDULER_LEASE, holder=None, expires_at=now)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        result = db.execute(
+            update(ClusterLease)
+            .where(
+                ClusterLease.name == SCHEDULER_LEASE,
+                (ClusterLease.holder == self.member_id) | (ClusterLease.expires_at < now),
+            )
+            .values(holder=self.member_id, expires_at=expires_at)
+        )
+        db.commit()
+
+        was_leader, self.is_leader = self.is_leader, result.rowcount == 1
+        if self.is_leader and not was_leader:
+            logger.info("%s became scheduler leader", self.member_id)
+        return self.is_leader
+
+    def rebalance(self, db: Session):
+        """Leader only: point pending jobs at their owner in the current ring."""
+        pending = db.query(MonitorJob.website_id).filter(MonitorJob.status == "pending").all()
+
+        by_owner = {}
+        for (website_id,) in pending:
+            by_owner.setdefault(self.owner(website_id), []).append(website_id)
+
+        for owner, website_ids in by_owner.items():
+            db.execute(
+                update(MonitorJob)
+                .where(
+                    MonitorJob.status == "pending",
+                    MonitorJob.website_id.in_(website_ids),
+                )
+                .values(owner=owner)
+                .execution_options(synchronize_session=False)
+            )
+
+        # Forget members that stopped heartbeating long ago
+        db.execute(
+            delete(WorkerMember).where(
+                WorkerMember.heartbeat_at < datetime.utcnow() - timedelta(seconds=CLUSTER_MEMBER_TTL * 10)
+            )
+        )
+        db.commit()
+
+    def tick(self, db: Session):
+        self.heartbeat(db)
+        changed = self.refresh_members(db)
+
+        was_leader = self.is_leader
+        self.acquire_leadership(db)  # acquire, or renew if already held
+        if self.is_leader and (changed or not was_leader):
+            self.rebalance(db)
+
+    def leave(self, db: Session):
+        db.execute(delete(WorkerMember).where(WorkerMember.id == self.member_id))
+        db.execute(
+            update(ClusterLease)
+            .where(ClusterLease.name == SCHEDULER_LEASE, ClusterLease.holder == self.member_id)
+            .values(holder=None, expires_at=datetime.utcnow())
+        )
+        db.commit()
+        self.is_leader = False
+
+
+def cluster_loop(cluster: Cluster, stop: threading.Event):
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            cluster.tick(db)
+        except Exception:
+            logger.exception("Cluster heartbeat failed")
+            db.rollback()
+        finally:
+            db.close()
+
+        stop.wait(CLUSTER_HEARTBEAT)
+
+    db = SessionLocal()
+    try:
+        cluster.leave(db)
+    finally:
+        db.close()
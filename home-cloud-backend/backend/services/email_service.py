@@ -1,21 +1,82 @@
 import os
+import time
 import smtplib
+import threading
 from email.mime.text import MIMEText
 
 SMTP_HOST = os.getenv("SMTP_HOST")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER)
+SMTP_IDLE_TIMEOUT = 60  # seconds before a reused connection is re-checked
 ALERT_EMAIL_TO = os.getenv("ALERT_EMAIL_TO")
 
 
-def send_email(subject: str, body: str):
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = SMTP_USER
-    msg["To"] = ALERT_EMAIL_TO
+class SMTPConnection:
+    """
+    Long-lived SMTP session. STARTTLS and login happen once per connection
+    instead of once per email; an idle connection is checked with NOOP
+    before reuse and reopened if the server dropped it.
+    """
 
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASS)
-        server.send_message(msg)
+    def __init__(self, host=None, port=None, user=None, password=None, starttls=None):
+        self.host = host or SMTP_HOST
+        self.port = port or SMTP_PORT
+        self.user = user if user is not None else SMTP_USER
+        self.password = password if password is not None else SMTP_PASS
+        self.starttls = SMTP_STARTTLS if starttls is None else starttls
+        self._server = None
+        self._last_used = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            server.starttls()
+        if self.user:
+            server.login(self.user, self.password)
+        return server
+
+    def _ensure(self):
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT:
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self._server = None
+
+        if self._server is None:
+            self._server = self._connect()
+
+    def send(self, to_email: str, subject: str, body: str):
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = SMTP_FROM or self.user or ""
+        msg["To"] = to_email
+
+        with self._lock:
+            self._ensure()
+            try:
+                self._server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between NOOP checks; reconnect once
+                self._server = self._connect()
+                self._server.send_message(msg)
+            self._last_used = time.monotonic()
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
+smtp_connection = SMTPConnection()
+
+
+def send_email(to_email: str, subject: str, body: str):
+    smtp_connection.send(to_email or ALERT_EMAIL_TO, subject, body)
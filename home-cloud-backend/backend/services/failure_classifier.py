@@ -1,9 +1,12 @@
+import asyncio
 import requests
 import socket
+import aiohttp
 from backend.core.failure_types import FailureType
 
 def classify_failure(response=None, exception=None, response_time_ms=None):
-    if response:
+    # response: a requests.Response or a ProbeResult, anything with .status_code
+    if response is not None:
         status = response.status_code
 
         if status == 200:
@@ -18,13 +21,18 @@ def classify_failure(response=None, exception=None, response_time_ms=None):
             return FailureType.SERVER_ERROR
 
     if exception:
-        if isinstance(exception, requests.exceptions.Timeout):
+        if isinstance(exception, (requests.exceptions.Timeout, asyncio.TimeoutError)):
             return FailureType.TIMEOUT
 
-        if isinstance(exception, requests.exceptions.ConnectionError):
-            return FailureType.NETWORK_FAILURE
-
         if isinstance(exception, socket.gaierror):
             return FailureType.DNS_FAILURE
 
+        if isinstance(exception, aiohttp.ClientConnectorError):
+            if isinstance(exception.os_error, socket.gaierror):
+                return FailureType.DNS_FAILURE
+            return FailureType.NETWORK_FAILURE
+
+        if isinstance(exception, (requests.exceptions.ConnectionError, aiohttp.ClientConnectionError)):
+            return FailureType.NETWORK_FAILURE
+
     return FailureType.UNKNOWN
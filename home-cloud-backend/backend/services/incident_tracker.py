@@ -0,0 +1,157 @@
+import os
+from sqlalchemy.orm import Session
+from backend.core.failure_types import FailureType
+from backend.models.incident import Incident
+from backend.models.website import Website
+from backend.services.sla_service import record_incident_downtime
+
+INCIDENT_OPEN_AFTER = int(os.getenv("INCIDENT_OPEN_AFTER", 3))  # consecutive failures
+INCIDENT_RESOLVE_AFTER = int(os.getenv("INCIDENT_RESOLVE_AFTER", 2))  # consecutive successes
+
+UP_TYPES = (FailureType.UP.value, FailureType.PERFORMANCE_DEGRADED.value)
+
+
+class SiteState:
+    __slots__ = ("failures", "successes", "is_open", "streak_since")
+
+    def __init__(self, failures=0, successes=0, is_open=False):
+        self.failures = failures
+        self.successes = successes
+        self.is_open = is_open
+        self.streak_since = None  # first result of the current up/down streak
+
+
+class Transition:
+    __slots__ = ("kind", "website_id", "tenant_id", "at", "reason")
+
+    def __init__(self, kind, website_id, tenant_id, at, reason=None):
+        self.kind = kind  # "open" | "resolve"
+        self.website_id = website_id
+        self.tenant_id = tenant_id
+        self.at = at
+        self.reason = reason
+
+
+class IncidentTracker:
+    """
+    Per-website up/down state machine fed by probe results.
+
+    An incident opens after `open_after` consecutive failures and resolves
+    after `resolve_after` consecutive successes; each result is O(1) work on
+    an in-memory counter. Only transitions touch the DB, in one batch per
+    result-writer flush. Used from the result writer thread only.
+    """
+
+    def __init__(self, open_after: int = INCIDENT_OPEN_AFTER, resolve_after: int = INCIDENT_RESOLVE_AFTER):
+        self.open_after = open_after
+        self.resolve_after = resolve_after
+        self._states = {}
+        self._loaded = False
+
+    def load(self, db: Session):
+        """
+        Rebuild state from open incidents and each site's latest stored
+        result (Website.failure_type) - two indexed queries, no history scan.
+        """
+        open_ids = {
+            website_id
+            for (website_id,) in db.query(Incident.website_id).filter(Incident.resolved_at.is_(None))
+        }
+
+        self._states = {}
+        for website_id, failure_type in db.query(Website.id, Website.failure_type).filter(Website.is_active == True):
+            is_up = failure_type is None or failure_type in UP_TYPES
+            self._states[website_id] = SiteState(
+                failures=0 if is_up else 1,
+                successes=1 if is_up else 0,
+                is_open=website_id in open_ids,
+            )
+
+        for website_id in open_ids - set(self._states):
+            self._states[website_id] = SiteState(is_open=True)
+
+        self._loaded = True
+
+    def invalidate(self):
+        """Reload state before the next batch, e.g. after shards moved."""
+        self._loaded = False
+
+    def observe(self, result):
+        state = self._states.get(result.website_id)
+        if state is None:
+            state = self._states[result.website_id] = SiteState()
+
+        # Incidents span from the first failure to the first success, not
+        # from the K-th / M-th result that confirmed the transition
+        if result.is_up:
+            if state.successes == 0:
+                state.streak_since = result.checked_at
+            state.failures = 0
+            state.successes += 1
+            if state.is_open and state.successes >= self.resolve_after:
+                state.is_open = False
+                return Transition(
+                    "resolve", result.website_id, result.tenant_id,
+                    state.streak_since or result.checked_at,
+                )
+        else:
+            if state.failures == 0:
+                state.streak_since = result.checked_at
+            state.successes = 0
+            state.failures += 1
+            if not state.is_open and state.failures >= self.open_after:
+                state.is_open = True
+                return Transition(
+                    "open", result.website_id, result.tenant_id,
+                    state.streak_since or result.checked_at,
+                    reason=result.failure_type.value,
+                )
+
+        return None
+
+    def process(self, db: Session, results) -> list:
+        """
+        Feed a batch of results through the state machine and write the
+        resulting incident opens/resolves in bulk. The caller commits, and
+        calls invalidate() if the commit fails.
+        """
+        if not self._loaded:
+            self.load(db)
+
+        transitions = [t for t in map(self.observe, results) if t is not None]
+        if not transitions:
+            return transitions
+
+        # Incidents already open in the DB for the sites resolving now
+        resolving = [t.website_id for t in transitions if t.kind == "resolve"]
+        open_incidents = {}
+        if resolving:
+            open_incidents = {
+                incident.website_id: incident
+                for incident in db.query(Incident).filter(
+                    Incident.website_id.in_(resolving),
+                    Incident.resolved_at.is_(None),
+                )
+            }
+
+        # Transitions are applied in order, so a site can open and resolve
+        # within one batch
+        for t in transitions:
+            if t.kind == "open":
+                incident = Incident(website_id=t.website_id, started_at=t.at, reason=t.reason)
+                db.add(incident)
+                open_incidents[t.website_id] = incident
+                continue
+
+            incident = open_incidents.pop(t.website_id, None)
+            if incident is None:
+                continue
+
+            incident.resolved_at = t.at
+            record_incident_downtime(db, incident)
+            db.flush()
+
+        return transitions
+
+
+incident_tracker = IncidentTracker()
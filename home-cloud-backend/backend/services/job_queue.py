@@ -0,0 +1,183 @@
+import os
+import logging
+from datetime import datetime, timedelta
+import threading
+from sqlalchemy import select, update, delete, func, or_, and_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.core.database import SessionLocal
+from backend.models.monitor_job import MonitorJob
+
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 60))
+JOB_RETENTION_HOURS = int(os.getenv("JOB_RETENTION_HOURS", 24))
+COMPACT_BATCH_SIZE = 5000
+COMPACT_INTERVAL = 600  # seconds
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_jobs(db: Session, due, owner_of=None):
+    """
+    Insert a pending job for each (website_id, tenant_id) in `due`. A site
+    that already has a pending job is skipped via the partial unique index,
+    so a backlog never holds more than one pending row per website.
+    owner_of(website_id) assigns the cluster member that should run it.
+    """
+    rows = [
+        {
+            "website_id": website_id,
+            "tenant_id": tenant_id,
+            "owner": owner_of(website_id) if owner_of else None,
+        }
+        for website_id, tenant_id in due
+    ]
+    if not rows:
+        return
+
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(MonitorJob).values(rows).on_conflict_do_nothing(
+        index_elements=["website_id"],
+        index_where=text("status = 'pending'"),
+    )
+
+    db.execute(stmt)
+    db.commit()
+
+
+def _claimable(now):
+    return or_(
+        MonitorJob.status == "pending",
+        and_(
+            MonitorJob.status == "running",
+            MonitorJob.lease_expires_at < now,
+        ),
+    )
+
+
+def claim_jobs(
+    db: Session,
+    worker_id: str,
+    limit: int,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+    owner: str = None,
+    live_members=None,
+):
+    """
+    Atomically lease up to `limit` jobs for `worker_id`.
+
+    Postgres picks the rows with FOR UPDATE SKIP LOCKED so concurrent workers
+    never block on or double-claim each other's rows. SQLite has no row locks,
+    but a single UPDATE ... RETURNING runs under the database write lock, which
+    gives the same guarantee. Jobs whose lease expired (crashed worker) are
+    claimable again.
+
+    With `owner`, only jobs of that cluster member's shard are taken, plus
+    unassigned jobs and jobs owned by members no longer in `live_members`.
+    """
+    now = datetime.utcnow()
+
+    claimable = _claimable(now)
+    if owner is not None:
+        claimable = and_(
+            claimable,
+            or_(
+                MonitorJob.owner == owner,
+                MonitorJob.owner.is_(None),
+                MonitorJob.owner.notin_(list(live_members or [owner])),
+            ),
+        )
+
+    candidates = (
+        select(MonitorJob.id)
+        .where(claimable)
+        .order_by(MonitorJob.created_at)
+        .limit(limit)
+    )
+
+    if db.bind.dialect.name == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    stmt = (
+        update(MonitorJob)
+        .where(MonitorJob.id.in_(candidates.scalar_subquery()))
+        .where(claimable)
+        .values(
+            status="running",
+            leased_by=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=func.coalesce(MonitorJob.attempts, 0) + 1,
+        )
+        .returning(MonitorJob.id, MonitorJob.website_id, MonitorJob.tenant_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    jobs = db.execute(stmt).all()
+    db.commit()
+    return jobs
+
+
+def complete_jobs(db: Session, worker_id: str, job_ids):
+    if not job_ids:
+        return
+
+    db.execute(
+        update(MonitorJob)
+        .where(
+            MonitorJob.id.in_(job_ids),
+            MonitorJob.leased_by == worker_id,
+        )
+        .values(
+            status="done",
+            executed_at=datetime.utcnow(),
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def compact_jobs(db: Session, retention_hours: int = JOB_RETENTION_HOURS, batch_size: int = COMPACT_BATCH_SIZE) -> int:
+    """
+    Delete done jobs older than the retention window, batch_size rows per
+    statement so the table is never locked for long. Returns rows deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    deleted = 0
+
+    while True:
+        batch = (
+            select(MonitorJob.id)
+            .where(
+                MonitorJob.status == "done",
+                MonitorJob.created_at < cutoff,
+            )
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(MonitorJob)
+            .where(MonitorJob.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def compactor_loop(stop: threading.Event = None):
+    stop = stop or threading.Event()
+
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            compact_jobs(db)
+        except Exception:
+            # Retried on the next run; finished jobs just pile up a bit longer
+            logger.exception("Job compaction failed")
+            db.rollback()
+        finally:
+            db.close()
+
+        stop.wait(COMPACT_INTERVAL)
@@ -0,0 +1,163 @@
+import os
+import asyncio
+import threading
+from collections import deque
+
+from backend.core.metrics import metrics
+
+LIVE_BACKLOG = int(os.getenv("LIVE_BACKLOG", 1000))  # events kept per tenant for resume
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", 500))  # undelivered events before a client is dropped
+LIVE_LATENCY_DELTA = float(os.getenv("LIVE_LATENCY_DELTA", 0.2))  # relative latency change worth an event
+LIVE_LATENCY_FLOOR = 50  # ms; smaller changes are noise
+
+metrics.counter("live_events_published_total", "Events published to live status streams")
+metrics.counter("live_subscribers_dropped_total", "Live stream clients dropped for falling behind")
+
+
+class LiveEvent:
+    __slots__ = ("id", "kind", "data")
+
+    def __init__(self, id, kind, data):
+        self.id = id
+        self.kind = kind
+        self.data = data
+
+
+class _Subscriber:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(LIVE_QUEUE_SIZE)
+        self.dropped = False
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: end the stream; the client resumes or re-snapshots
+            self.dropped = True
+            metrics.inc("live_subscribers_dropped_total")
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class LiveEventBus:
+    """
+    In-process pub/sub of per-tenant status deltas. Publishers (the result
+    writer, website routes) call publish() from any thread; each SSE client
+    holds an asyncio queue on the API loop. Event ids increase globally and
+    the last `backlog` events of each tenant are kept, so a reconnecting
+    client can resume from Last-Event-ID instead of taking a new snapshot.
+    """
+
+    def __init__(self, backlog: int = LIVE_BACKLOG):
+        self.backlog = backlog
+        self._seq = 0
+        self._history = {}  # tenant id -> deque of LiveEvent
+        self._evicted = {}  # tenant id -> newest event id that fell out of the backlog
+        self._subscribers = {}  # tenant id -> set of _Subscriber
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        return self._seq
+
+    def publish(self, tenant_id, kind: str, data: dict):
+        with self._lock:
+            self._seq += 1
+            event = LiveEvent(self._seq, kind, data)
+            history = self._history.get(tenant_id)
+            if history is None:
+                history = self._history[tenant_id] = deque(maxlen=self.backlog)
+            if len(history) == history.maxlen:
+                self._evicted[tenant_id] = history[0].id
+            history.append(event)
+            subscribers = list(self._subscribers.get(tenant_id, ()))
+
+        metrics.inc("live_events_published_total")
+        for sub in subscribers:
+            sub.loop.call_soon_threadsafe(sub.deliver, event)
+
+    def subscribe(self, tenant_id) -> _Subscriber:
+        sub = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(tenant_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, tenant_id, sub: _Subscriber):
+        with self._lock:
+            subs = self._subscribers.get(tenant_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[tenant_id]
+
+    def replay(self, tenant_id, after_id: int):
+        """
+        Events of the tenant newer than after_id, or None when the backlog
+        no longer reaches back that far (the client needs a snapshot).
+        """
+        with self._lock:
+            history = list(self._history.get(tenant_id, ()))
+            evicted = self._evicted.get(tenant_id, 0)
+            seq = self._seq
+
+        if after_id > seq or after_id < evicted:
+            return None  # id from before a restart, or events were lost
+        return [event for event in history if event.id > after_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+live_events = LiveEventBus()
+metrics.gauge("live_subscribers", live_events.subscriber_count, "Connected live status stream clients")
+
+
+class LivePublisher:
+    """
+    Turns result-writer batches into site deltas: an event is only
+    published when a site's status or failure type changes, or its latency
+    moves by more than LIVE_LATENCY_DELTA (and LIVE_LATENCY_FLOOR ms).
+    The publish_* methods run on the result writer thread.
+    """
+
+    def __init__(self, bus: LiveEventBus = live_events):
+        self.bus = bus
+        self._last = {}  # website id -> (status, failure type, response time)
+
+    def publish_results(self, results):
+        for r in results:
+            status = "UP" if r.is_up else "DOWN"
+            last = self._last.get(r.website_id)
+            if last is not None and last[0] == status and last[1] == r.failure_type.value:
+                delta = abs(r.response_time_ms - last[2])
+                if delta < LIVE_LATENCY_FLOOR or delta < last[2] * LIVE_LATENCY_DELTA:
+                    continue
+
+            self._last[r.website_id] = (status, r.failure_type.value, r.response_time_ms)
+            self.bus.publish(r.tenant_id, "site", {
+                "id": r.website_id,
+                "status": status,
+                "failure_type": r.failure_type.value,
+                "response_time_ms": r.response_time_ms,
+                "last_checked": r.checked_at.isoformat(),
+            })
+
+    def publish_transitions(self, transitions):
+        for t in transitions:
+            self.bus.publish(t.tenant_id, "incident", {
+                "website_id": t.website_id,
+                "state": "open" if t.kind == "open" else "resolved",
+                "at": t.at.isoformat(),
+                "reason": t.reason,
+            })
+
+    def forget(self, website_id):
+        self._last.pop(website_id, None)
+
+
+live_publisher = LivePublisher()
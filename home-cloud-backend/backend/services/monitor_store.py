@@ -1 +0,0 @@
-monitored_websites = {}
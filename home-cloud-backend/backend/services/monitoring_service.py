@@ -1,23 +0,0 @@
-import time
-import requests
-from datetime import datetime
-from backend.core.database import SessionLocal
-from backend.models.website import Website
-
-def run_monitoring_cycle():
-    while True:
-        db = SessionLocal()
-        websites = db.query(Website).filter(Website.is_active == True).all()
-
-        for site in websites:
-            try:
-                response = requests.get(site.url, timeout=10)
-                site.last_status = "UP" if response.status_code == 200 else "DOWN"
-            except Exception:
-                site.last_status = "DOWN"
-
-            site.last_checked = datetime.utcnow()
-            db.commit()
-
-        db.close()
-        time.sleep(60)
@@ -1,19 +1,84 @@
-import requests
+import os
+import json
+import asyncio
+import aiohttp
 
-OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
-MODEL_NAME = "phi"
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434/api/generate")
+MODEL_NAME = os.getenv("OLLAMA_MODEL", "phi")
+EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", 5))  # seconds
+# Max silence between streamed chunks, not a cap on the whole generation
+OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", 120))  # seconds
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", 32))
 
 
-def generate_response(prompt: str) -> str:
-    payload = {
-        "model": MODEL_NAME,
-        "prompt": prompt,
-        "stream": False
-    }
+class OllamaError(RuntimeError):
+    pass
 
-    response = requests.post(OLLAMA_URL, json=payload, timeout=120)
 
-    if response.status_code != 200:
-        raise RuntimeError(response.text)
+class OllamaClient:
+    """
+    Async client for Ollama's /api/generate. Requests always stream: the
+    NDJSON chunks are yielded as they arrive, so callers see the first
+    token as soon as the model produces it. One keep-alive session per
+    event loop.
+    """
 
-    return response.json().get("response", "").strip()
+    def __init__(self, url: str = OLLAMA_URL, model: str = MODEL_NAME):
+        self.url = url
+        self.model = model
+        self._sessions = {}
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=OLLAMA_POOL_SIZE, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=OLLAMA_CONNECT_TIMEOUT,
+                    sock_read=OLLAMA_READ_TIMEOUT,
+                ),
+            )
+        return session
+
+    async def stream(self, prompt: str, **options):
+        """Yield response tokens as Ollama generates them."""
+        payload = {"model": self.model, "prompt": prompt, "stream": True, **options}
+
+        async with self._session().post(self.url, json=payload) as response:
+            if response.status != 200:
+                raise OllamaError(await response.text())
+
+            # One JSON object per line; the last one has "done": true
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise OllamaError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    return
+
+    async def generate(self, prompt: str, **options) -> str:
+        parts = [token async for token in self.stream(prompt, **options)]
+        return "".join(parts).strip()
+
+    async def embed(self, text: str, model: str = EMBED_MODEL) -> list:
+        url = self.url.rsplit("/", 1)[0] + "/embeddings"
+        async with self._session().post(url, json={"model": model, "prompt": text}) as response:
+            if response.status != 200:
+                raise OllamaError(await response.text())
+            return (await response.json())["embedding"]
+
+    async def close(self):
+        """Close the session of the current loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+ollama_client = OllamaClient()
@@ -0,0 +1,127 @@
+import os
+import time
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import aiohttp
+
+from backend.core.background_loop import run_coroutine
+from backend.core.failure_types import FailureType
+from backend.services.failure_classifier import classify_failure
+
+PROBE_CONCURRENCY = int(os.getenv("PROBE_CONCURRENCY", 200))  # in-flight probes overall
+PROBE_PER_HOST = int(os.getenv("PROBE_PER_HOST", 4))  # open connections per host
+PROBE_TIMEOUT = float(os.getenv("PROBE_TIMEOUT", 10))  # seconds
+PROBE_DNS_TTL = int(os.getenv("PROBE_DNS_TTL", 300))  # seconds
+
+
+@dataclass
+class ProbeResult:
+    website_id: int
+    url: str
+    tenant_id: Optional[str] = None
+    status_code: Optional[int] = None
+    response_time_ms: int = 0
+    exception: Optional[BaseException] = None
+    failure_type: FailureType = FailureType.UNKNOWN
+    checked_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def is_up(self) -> bool:
+        return self.failure_type in (FailureType.UP, FailureType.PERFORMANCE_DEGRADED)
+
+
+class ProbeEngine:
+    """
+    Concurrent HTTP prober. One aiohttp session is shared by every probe so
+    connections are kept alive and DNS answers are cached between cycles.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = PROBE_CONCURRENCY,
+        per_host: int = PROBE_PER_HOST,
+        timeout: float = PROBE_TIMEOUT,
+        dns_ttl: int = PROBE_DNS_TTL,
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.dns_ttl = dns_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        if self._session is not None:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def probe(self, website_id: int, url: str, tenant_id=None) -> ProbeResult:
+        await self.start()
+
+        result = ProbeResult(website_id=website_id, url=url, tenant_id=tenant_id)
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                async with self._session.get(url, allow_redirects=True) as response:
+                    result.status_code = response.status
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+            except Exception as e:
+                result.exception = e
+
+            result.response_time_ms = int((time.perf_counter() - start) * 1000)
+
+        result.checked_at = datetime.utcnow()
+        result.failure_type = classify_failure(
+            response=result if result.status_code is not None else None,
+            exception=result.exception,
+            response_time_ms=result.response_time_ms,
+        )
+        return result
+
+    async def probe_many(self, targets) -> list:
+        """
+        targets: iterable of (website_id, url) or (website_id, url, tenant_id)
+        """
+        return await asyncio.gather(*(self.probe(*target) for target in targets))
+
+
+# Shared engine on the background loop, so the threaded loops reuse the
+# same connection pool and DNS cache across cycles.
+_engine = ProbeEngine()
+
+
+def probe_websites(targets) -> list:
+    """
+    Blocking entry point for the monitoring loops: probes every target
+    concurrently and returns a list of ProbeResult in the same order.
+    """
+    targets = list(targets)
+    if not targets:
+        return []
+
+    return run_coroutine(_engine.probe_many(targets))
+
+
+def close_probe_engine():
+    run_coroutine(_engine.close())
@@ -0,0 +1,227 @@
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from backend.services.result_writer import result_writer
+
+PROBE_PROCESSES = int(os.getenv("PROBE_PROCESSES", 0))  # 0 = probe on the in-process loop
+PROBE_STREAM_CHUNK = int(os.getenv("PROBE_STREAM_CHUNK", 50))  # results per pipe message
+PROBE_STREAM_INTERVAL = 0.1  # seconds before a partial chunk is sent anyway
+
+logger = logging.getLogger(__name__)
+
+
+def _probe_process(conn):
+    """
+    Child entry point: one event loop and one ProbeEngine per process.
+    Receives (batch_id, targets), probes them concurrently and streams
+    ("results", batch_id, [ProbeResult]) chunks back as probes finish,
+    then ("done", batch_id).
+    """
+    from backend.services.probe_engine import ProbeEngine
+
+    engine = ProbeEngine()
+    loop = asyncio.new_event_loop()
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    async def run_batch(batch_id, targets):
+        chunk = []
+        last_sent = loop.time()
+
+        for future in asyncio.as_completed([engine.probe(*target) for target in targets]):
+            result = await future
+            # Exceptions don't reliably pickle; the failure type carries what the writer needs
+            result.exception = None
+            chunk.append(result)
+
+            if len(chunk) >= PROBE_STREAM_CHUNK or loop.time() - last_sent >= PROBE_STREAM_INTERVAL:
+                send(("results", batch_id, chunk))
+                chunk, last_sent = [], loop.time()
+
+        if chunk:
+            send(("results", batch_id, chunk))
+        send(("done", batch_id))
+
+    def receive():
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                message = None
+
+            if message is None:
+                loop.call_soon_threadsafe(loop.stop)
+                return
+
+            batch_id, targets = message
+            asyncio.run_coroutine_threadsafe(run_batch(batch_id, targets), loop)
+
+    threading.Thread(target=receive, name="probe-receiver", daemon=True).start()
+    loop.run_forever()
+    loop.run_until_complete(engine.close())
+    conn.close()
+
+
+class _Batch:
+    def __init__(self, partitions: int):
+        self.remaining = partitions
+        self.done = threading.Event()
+
+
+class ProbePool:
+    """
+    Runs probes in K child processes, each with its own event loop, so TLS
+    handshakes and response parsing are spread over several cores. Targets
+    are partitioned by website id; each child streams results back over
+    its pipe in small chunks, and a collector thread hands them to `sink`
+    (the result writer) as they arrive.
+    """
+
+    def __init__(self, processes: int = PROBE_PROCESSES, sink=None):
+        self.processes = processes
+        self.sink = sink
+        self._context = multiprocessing.get_context("spawn")
+        self._children = []  # (process, connection, send lock)
+        self._batches = {}
+        self._owners = {}  # batch_id -> set of child indexes still working on it
+        self._next_batch = 0
+        self._lock = threading.Lock()
+        self._collector = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _spawn_child(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_probe_process, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn, threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._children = [self._spawn_child() for _ in range(self.processes)]
+            self._running = True
+
+        self._collector = threading.Thread(target=self._collect, name="probe-collector", daemon=True)
+        self._collector.start()
+        logger.info("Started probe pool with %d processes", self.processes)
+
+    def stop(self, timeout: float = 30):
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            children, self._children = self._children, []
+
+        for process, conn, send_lock in children:
+            with send_lock:
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+
+        self._collector.join(timeout)
+        self._collector = None
+
+        for process, conn, send_lock in children:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+
+        # Nobody is left to answer; release any waiters
+        with self._lock:
+            for batch in self._batches.values():
+                batch.done.set()
+            self._batches.clear()
+            self._owners.clear()
+
+    def run(self, targets, timeout: float = None):
+        """
+        Probe targets ((website_id, url, tenant_id) tuples) across the
+        children and block until every partition has reported done. Results
+        go to the sink while the batch is still running.
+        """
+        partitions = {}
+        for target in targets:
+            partitions.setdefault(target[0] % self.processes, []).append(tuple(target))
+        if not partitions:
+            return
+
+        with self._lock:
+            batch_id = self._next_batch
+            self._next_batch += 1
+            batch = self._batches[batch_id] = _Batch(len(partitions))
+            self._owners[batch_id] = set(partitions)
+            children = list(self._children)
+
+        for index, part in partitions.items():
+            process, conn, send_lock = children[index]
+            with send_lock:
+                conn.send((batch_id, part))
+
+        batch.done.wait(timeout)
+
+    def _finish(self, batch_id, index):
+        with self._lock:
+            owners = self._owners.get(batch_id)
+            if owners is None or index not in owners:
+                return
+            owners.discard(index)
+            batch = self._batches[batch_id]
+            batch.remaining -= 1
+            if batch.remaining == 0:
+                del self._batches[batch_id]
+                del self._owners[batch_id]
+                batch.done.set()
+
+    def _child_died(self, index):
+        with self._lock:
+            if not self._running:
+                return
+            process, conn, send_lock = self._children[index]
+            logger.error("Probe process %d exited (code %s); restarting", process.pid, process.exitcode)
+            conn.close()
+            self._children[index] = self._spawn_child()
+            lost = [batch_id for batch_id, owners in self._owners.items() if index in owners]
+
+        # Its in-flight probes are lost; the jobs get rescheduled next interval
+        for batch_id in lost:
+            self._finish(batch_id, index)
+
+    def _collect(self):
+        while True:
+            with self._lock:
+                if not self._running and not self._batches:
+                    return
+                conns = {conn: index for index, (_, conn, _) in enumerate(self._children)}
+            if not conns:
+                return
+
+            for conn in wait(list(conns), timeout=0.5):
+                index = conns[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    self._child_died(index)
+                    continue
+
+                if message[0] == "results":
+                    if self.sink is not None:
+                        self.sink(message[2])
+                else:
+                    self._finish(message[1], index)
+
+
+probe_pool = ProbePool(sink=result_writer.add)
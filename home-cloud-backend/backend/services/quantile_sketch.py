@@ -0,0 +1,71 @@
+import math
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram (DDSketch style) for response times.
+
+    Every value lands in bucket ceil(log_gamma(value)), so any quantile is
+    answered within `relative_accuracy` of the true value. Two sketches with
+    the same accuracy merge by adding bucket counts, which is what lets the
+    1m rollups be combined into 1h/1d ones and queried over any range.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}  # bucket index -> count
+        self.zero_count = 0  # values <= 1 ms
+        self.count = 0
+
+    def add(self, value, count: int = 1):
+        if value is None:
+            return
+
+        if value <= 1:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+
+        self.count += count
+
+    def merge(self, other: "QuantileSketch"):
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float):
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Midpoint of the bucket in value space
+                return 2 * self.gamma ** index / (1 + self.gamma)
+
+        return 2 * self.gamma ** max(self.bins) / (1 + self.gamma)
+
+    def to_dict(self) -> dict:
+        return {
+            "a": self.relative_accuracy,
+            "z": self.zero_count,
+            "b": {str(k): v for k, v in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data.get("a", 0.01))
+        sketch.zero_count = data.get("z", 0)
+        sketch.bins = {int(k): v for k, v in data.get("b", {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
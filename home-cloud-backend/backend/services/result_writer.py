@@ -0,0 +1,170 @@
+import os
+import uuid
+import logging
+import threading
+from sqlalchemy import insert, update
+from backend.core.database import SessionLocal
+from backend.models.monitoring_result import MonitoringResult
+from backend.models.website import Website
+from backend.services.rollup_service import ingest_rollups
+from backend.services.incident_tracker import incident_tracker
+from backend.services.alert_service import record_alert_state, notify_transitions
+from backend.services.status_cache import status_cache
+from backend.services.live_events import live_publisher
+
+RESULT_FLUSH_SIZE = int(os.getenv("RESULT_FLUSH_SIZE", 500))  # results per batch
+RESULT_FLUSH_INTERVAL = float(os.getenv("RESULT_FLUSH_INTERVAL", 2.0))  # seconds
+# Results kept for retry while the DB is failing; the oldest are dropped beyond this
+RESULT_MAX_BUFFER = int(os.getenv("RESULT_MAX_BUFFER", 50000))
+
+logger = logging.getLogger(__name__)
+
+
+class ResultWriter:
+    """
+    Buffers ProbeResults and persists them in batches: one executemany
+    INSERT into monitoring_results, one bulk UPDATE of the matching
+    websites, one merge into the rollups and the incident transitions per
+    flush. A flush happens when the buffer reaches flush_size
+    or flush_interval seconds after the last one, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        flush_size: int = RESULT_FLUSH_SIZE,
+        flush_interval: float = RESULT_FLUSH_INTERVAL,
+        max_buffer: int = RESULT_MAX_BUFFER,
+    ):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def add(self, results):
+        if not self._running:
+            self.start()
+
+        with self._cond:
+            self._buffer.extend(results)
+            if len(self._buffer) >= self.flush_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._buffer) < self.flush_size:
+                    self._cond.wait(self.flush_interval)
+                running = self._running
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing probe results failed")
+                with self._cond:
+                    if self._running:
+                        self._cond.wait(self.flush_interval)  # don't spin on a failing DB
+
+            if not running:
+                return
+
+    def flush(self):
+        with self._cond:
+            batch, self._buffer = self._buffer, []
+
+        if not batch:
+            return
+
+        try:
+            latest, transitions = self._write(batch)
+        except Exception:
+            # observe() already moved the in-memory incident state past this
+            # batch; rebuild it from the DB so the retry emits its transitions
+            incident_tracker.invalidate()
+            with self._cond:
+                self._buffer[:0] = batch  # retried on the next flush
+                dropped = len(self._buffer) - self.max_buffer
+                if dropped > 0:
+                    del self._buffer[:dropped]
+                    logger.error("Result buffer full, dropped the %d oldest results", dropped)
+            raise
+
+        # Only once the batch is committed
+        status_cache.apply(latest.values())
+        live_publisher.publish_results(latest.values())
+        live_publisher.publish_transitions(transitions)
+
+    def _write(self, results):
+        # Several results for one site can land in a batch; the newest wins
+        latest = {}
+        for r in results:
+            latest[r.website_id] = r
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                insert(MonitoringResult),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "website_id": r.website_id,
+                        "tenant_id": r.tenant_id,
+                        "status_code": r.status_code,
+                        "response_time_ms": r.response_time_ms,
+                        "error_type": r.failure_type.value,
+                        "checked_at": r.checked_at,
+                    }
+                    for r in results
+                ],
+            )
+            db.execute(
+                update(Website),
+                [
+                    {
+                        "id": r.website_id,
+                        "last_status": "UP" if r.is_up else "DOWN",
+                        "last_checked": r.checked_at,
+                        "response_time_ms": r.response_time_ms,
+                        "failure_type": r.failure_type.value,
+                    }
+                    for r in latest.values()
+                ],
+            )
+            ingest_rollups(db, results)
+            transitions = incident_tracker.process(db, results)
+            record_alert_state(db, transitions)
+            db.commit()
+
+            # Only once the incidents are recorded; a failure here must not
+            # make the committed batch retry
+            try:
+                notify_transitions(db, transitions)
+            except Exception:
+                logger.exception("Queueing alerts failed")
+        finally:
+            db.close()
+
+        return latest, transitions
+
+
+result_writer = ResultWriter()
@@ -0,0 +1,240 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from backend.core.database import SessionLocal
+from backend.models.metric_rollup import MetricRollup
+from backend.models.monitoring_result import MonitoringResult
+from backend.services.quantile_sketch import QuantileSketch
+
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# How long each tier is kept; None = forever
+RETENTION_DAYS = {
+    "raw": int(os.getenv("RAW_RESULT_RETENTION_DAYS", 7)),
+    "1m": int(os.getenv("ROLLUP_1M_RETENTION_DAYS", 7)),
+    "1h": int(os.getenv("ROLLUP_1H_RETENTION_DAYS", 90)),
+    "1d": None,
+}
+RETENTION_INTERVAL = 3600  # seconds
+RETENTION_BATCH_SIZE = 5000  # rows per DELETE
+UPSERT_BATCH_SIZE = 1000  # rollup rows per INSERT ... ON CONFLICT
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_start(ts: datetime, seconds: int) -> datetime:
+    offset = int((ts - EPOCH).total_seconds()) // seconds * seconds
+    return EPOCH + timedelta(seconds=offset)
+
+
+class _Bucket:
+    def __init__(self):
+        self.count = 0
+        self.up_count = 0
+        self.min_ms = None
+        self.max_ms = None
+        self.sum_ms = 0.0
+        self.sketch = QuantileSketch()
+
+    def add(self, response_time_ms, is_up):
+        self.count += 1
+        self.up_count += 1 if is_up else 0
+        if response_time_ms is not None:
+            self.min_ms = response_time_ms if self.min_ms is None else min(self.min_ms, response_time_ms)
+            self.max_ms = response_time_ms if self.max_ms is None else max(self.max_ms, response_time_ms)
+            self.sum_ms += response_time_ms
+            self.sketch.add(response_time_ms)
+
+def ingest_rollups(db: Session, results):
+    """
+    Fold a batch of ProbeResults into the 1m/1h/1d rollups. Buckets are
+    aggregated in memory first, then upserted, so concurrent writers
+    adding to the same bucket never collide on its unique key. The caller
+    commits.
+    """
+    buckets = {}
+    for r in results:
+        for resolution, seconds in RESOLUTIONS.items():
+            key = (r.website_id, resolution, bucket_start(r.checked_at, seconds))
+            buckets.setdefault(key, _Bucket()).add(r.response_time_ms, r.is_up)
+
+    if not buckets:
+        return
+
+    if db.bind.dialect.name == "postgresql":
+        insert, least, greatest = pg_insert, func.least, func.greatest
+    else:
+        insert, least, greatest = sqlite_insert, func.min, func.max  # scalar min()/max() in SQLite
+
+    rows = [
+        {
+            "website_id": website_id,
+            "resolution": resolution,
+            "bucket_start": start,
+            "count": bucket.count,
+            "up_count": bucket.up_count,
+            "min_ms": bucket.min_ms,
+            "max_ms": bucket.max_ms,
+            "sum_ms": bucket.sum_ms,
+        }
+        for (website_id, resolution, start), bucket in buckets.items()
+    ]
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(MetricRollup).values(rows[i:i + UPSERT_BATCH_SIZE])
+        excluded = stmt.excluded
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["website_id", "resolution", "bucket_start"],
+            set_={
+                "count": MetricRollup.count + excluded.count,
+                "up_count": MetricRollup.up_count + excluded.up_count,
+                "sum_ms": MetricRollup.sum_ms + excluded.sum_ms,
+                # NULL when either side has no timings; fall back to the other
+                "min_ms": func.coalesce(least(MetricRollup.min_ms, excluded.min_ms), MetricRollup.min_ms, excluded.min_ms),
+                "max_ms": func.coalesce(greatest(MetricRollup.max_ms, excluded.max_ms), MetricRollup.max_ms, excluded.max_ms),
+            },
+        ))
+
+    # Sketches merge in Python; the upsert already holds these rows' locks
+    # until commit, so no other writer can interleave here
+    for row in db.query(MetricRollup).populate_existing().filter(
+        tuple_(
+            MetricRollup.website_id,
+            MetricRollup.resolution,
+            MetricRollup.bucket_start,
+        ).in_(list(buckets))
+    ):
+        bucket = buckets[(row.website_id, row.resolution, row.bucket_start)]
+        sketch = QuantileSketch.from_dict(row.sketch) if row.sketch else QuantileSketch()
+        row.sketch = sketch.merge(bucket.sketch).to_dict()
+
+
+def pick_resolution(start: datetime, end: datetime) -> str:
+    span = end - start
+    if span <= timedelta(hours=6):
+        return "1m"
+    if span <= timedelta(days=14):
+        return "1h"
+    return "1d"
+
+
+def _point(row: MetricRollup, sketch: QuantileSketch) -> dict:
+    return {
+        "bucket_start": row.bucket_start,
+        "count": row.count,
+        "availability": round(row.up_count / row.count * 100, 4) if row.count else None,
+        "min_ms": row.min_ms,
+        "max_ms": row.max_ms,
+        "avg_ms": round(row.sum_ms / row.count, 2) if row.count else None,
+        "p50_ms": sketch.quantile(0.50),
+        "p95_ms": sketch.quantile(0.95),
+        "p99_ms": sketch.quantile(0.99),
+    }
+
+
+def get_series(db: Session, website_id: int, start: datetime, end: datetime, resolution: str = None):
+    """
+    Chart points for a website between start and end, plus a summary that
+    merges every bucket in the range.
+    """
+    resolution = resolution or pick_resolution(start, end)
+
+    rows = (
+        db.query(MetricRollup)
+        .filter(
+            MetricRollup.website_id == website_id,
+            MetricRollup.resolution == resolution,
+            MetricRollup.bucket_start >= bucket_start(start, RESOLUTIONS[resolution]),
+            MetricRollup.bucket_start < end,
+        )
+        .order_by(MetricRollup.bucket_start)
+        .all()
+    )
+
+    total = MetricRollup(count=0, up_count=0, sum_ms=0)
+    total_sketch = QuantileSketch()
+    points = []
+
+    for row in rows:
+        sketch = QuantileSketch.from_dict(row.sketch) if row.sketch else QuantileSketch()
+        points.append(_point(row, sketch))
+
+        total.count += row.count
+        total.up_count += row.up_count
+        total.sum_ms += row.sum_ms
+        if row.min_ms is not None:
+            total.min_ms = row.min_ms if total.min_ms is None else min(total.min_ms, row.min_ms)
+            total.max_ms = row.max_ms if total.max_ms is None else max(total.max_ms, row.max_ms)
+        total_sketch.merge(sketch)
+
+    summary = _point(total, total_sketch)
+    summary.pop("bucket_start")
+
+    return {
+        "resolution": resolution,
+        "summary": summary,
+        "points": points,
+    }
+
+
+def _delete_batched(db: Session, model, *criteria, batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """DELETE matching rows batch_size at a time, committing in between."""
+    deleted = 0
+
+    while True:
+        batch = select(model.id).where(*criteria).limit(batch_size)
+        result = db.execute(
+            delete(model)
+            .where(model.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def apply_retention(db: Session):
+    """
+    Drop raw results and fine-grained rollups past their retention; the
+    coarser rollups already hold their aggregates. Deletes run in batches
+    so the writer is never locked out for the whole purge.
+    """
+    now = datetime.utcnow()
+
+    raw_days = RETENTION_DAYS["raw"]
+    _delete_batched(db, MonitoringResult, MonitoringResult.checked_at < now - timedelta(days=raw_days))
+
+    for resolution in RESOLUTIONS:
+        days = RETENTION_DAYS[resolution]
+        if days is None:
+            continue
+        _delete_batched(
+            db, MetricRollup,
+            MetricRollup.resolution == resolution,
+            MetricRollup.bucket_start < now - timedelta(days=days),
+        )
+
+
+def retention_loop(stop: threading.Event = None):
+    stop = stop or threading.Event()
+
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            apply_retention(db)
+        except Exception:
+            # Retried on the next run
+            logger.exception("Applying retention failed")
+            db.rollback()
+        finally:
+            db.close()
+
+        stop.wait(RETENTION_INTERVAL)
@@ -1,32 +1,195 @@
+import os
 import time
+import heapq
+import random
+import logging
+import threading
 from sqlalchemy.orm import Session
 from backend.core.database import SessionLocal
 from backend.models.website import Website
-from backend.models.monitor_job import MonitorJob
+from backend.services.job_queue import enqueue_jobs
 
-SCHEDULER_INTERVAL = 30  # seconds
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", 0.1))  # fraction of interval
+SCHEDULER_RESYNC = int(os.getenv("SCHEDULER_RESYNC", 60))  # seconds between DB resyncs
+MIN_INTERVAL = 10  # seconds
+SCHEDULER_MAX_BACKOFF = 60  # seconds between retries after repeated failures
 
-def scheduler_loop():
-    while True:
-        db: Session = SessionLocal()
+logger = logging.getLogger(__name__)
 
+
+class DueScheduler:
+    """
+    Min-heap of next-due times keyed by website id.
+
+    Heap entries are (due_at, website_id, version). Rescheduling or removing a
+    site bumps its version, and stale heap entries are skipped when popped.
+    """
+
+    def __init__(self, jitter: float = SCHEDULER_JITTER):
+        self.jitter = jitter
+        self._heap = []
+        self._sites = {}  # website_id -> (version, interval, tenant_id)
+        self._version = 0
+        self._cond = threading.Condition()
+        self._wakeups = 0  # bumped by wake() to release wait_for_due early
+
+    def __len__(self):
+        return len(self._sites)
+
+    def _next_due(self, interval, now):
+        spread = interval * self.jitter
+        return now + interval + random.uniform(-spread, spread)
+
+    def _push(self, website_id, interval, tenant_id, due_at):
+        self._version += 1
+        self._sites[website_id] = (self._version, interval, tenant_id)
+        heapq.heappush(self._heap, (due_at, website_id, self._version))
+
+    def schedule(self, website_id: int, interval: int, tenant_id=None, due_now=False):
+        """
+        Add a site or change its interval. New sites get a random offset
+        within their first interval so a bulk load doesn't fire at once.
+        """
+        interval = max(int(interval or 60), MIN_INTERVAL)
+        now = time.monotonic()
+
+        with self._cond:
+            current = self._sites.get(website_id)
+            if current and current[1] == interval and current[2] == tenant_id and not due_now:
+                return
+
+            if due_now:
+                due_at = now
+            elif current:
+                due_at = self._next_due(interval, now)
+            else:
+                due_at = now + random.uniform(0, interval)
+
+            self._push(website_id, interval, tenant_id, due_at)
+            self._cond.notify()
+
+    def wake(self):
+        """Make any wait_for_due() return now, e.g. so the loop sees a stop."""
+        with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def remove(self, website_id: int):
+        with self._cond:
+            if self._sites.pop(website_id, None) is not None:
+                self._cond.notify()
+
+    def sync(self, rows):
+        """
+        Reconcile with the active sites in the DB: rows of
+        (website_id, interval, tenant_id). Catches changes made by other
+        processes that never called schedule()/remove() here.
+        """
+        seen = set()
+        for website_id, interval, tenant_id in rows:
+            seen.add(website_id)
+            self.schedule(website_id, interval, tenant_id)
+
+        with self._cond:
+            for website_id in list(self._sites):
+                if website_id not in seen:
+                    del self._sites[website_id]
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, website_id, version = heapq.heappop(self._heap)
+            entry = self._sites.get(website_id)
+            if entry is None or entry[0] != version:
+                continue  # stale entry
+
+            _, interval, tenant_id = entry
+            due.append((website_id, tenant_id))
+            self._push(website_id, interval, tenant_id, self._next_due(interval, now))
+        return due
+
+    def _drop_stale_head(self):
+        while self._heap:
+            _, website_id, version = self._heap[0]
+            entry = self._sites.get(website_id)
+            if entry is not None and entry[0] == version:
+                return
+            heapq.heappop(self._heap)
+
+    def wait_for_due(self, timeout: float) -> list:
+        """
+        Sleep until the earliest site is due (or timeout), then return every
+        (website_id, tenant_id) that is due and reschedule it.
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            wakeups = self._wakeups
+            while True:
+                now = time.monotonic()
+                self._drop_stale_head()
+
+                if self._heap and self._heap[0][0] <= now:
+                    return self._pop_due(now)
+
+                remaining = deadline - now
+                if remaining <= 0 or self._wakeups != wakeups:
+                    return []
+
+                if self._heap:
+                    remaining = min(remaining, self._heap[0][0] - now)
+
+                self._cond.wait(remaining)
+
+
+scheduler = DueScheduler()
+
+
+def resync_schedule(db: Session):
+    rows = (
+        db.query(Website.id, Website.interval, Website.tenant_id)
+        .filter(Website.is_active == True)
+        .all()
+    )
+    scheduler.sync(rows)
+
+
+def scheduler_loop(stop: threading.Event = None, cluster=None):
+    """
+    With a cluster, every member keeps its heap in sync but only the
+    leader enqueues, tagging each job with the member that owns the site.
+    """
+    stop = stop or threading.Event()
+    next_sync = 0
+    failures = 0
+
+    while not stop.is_set():
         try:
-            websites = (
-                db.query(Website)
-                .filter(Website.is_active == True)
-                .all()
-            )
+            now = time.monotonic()
 
-            for site in websites:
-                job = MonitorJob(
-                    website_id=site.id,
-                    tenant_id=site.tenant_id,
-                )
-                db.add(job)
+            if now >= next_sync:
+                db: Session = SessionLocal()
+                try:
+                    resync_schedule(db)
+                finally:
+                    db.close()
+                next_sync = now + SCHEDULER_RESYNC
 
-            db.commit()
+            due = scheduler.wait_for_due(timeout=max(next_sync - time.monotonic(), 0))
+            if not due or stop.is_set():
+                continue
 
-        finally:
-            db.close()
+            if cluster is not None and not cluster.is_leader:
+                continue
 
-        time.sleep(SCHEDULER_INTERVAL)
+            db: Session = SessionLocal()
+            try:
+                enqueue_jobs(db, due, cluster.owner if cluster is not None else None)
+            finally:
+                db.close()
+            failures = 0
+        except Exception:
+            # A failed resync or enqueue must not stop scheduling for good
+            failures += 1
+            logger.exception("Scheduler iteration failed (%d in a row)", failures)
+            stop.wait(min(2 ** failures, SCHEDULER_MAX_BACKOFF))
@@ -1,33 +1,178 @@
-from datetime import datetime
+import sys
+from datetime import datetime, time, timedelta
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
+from backend.core.database import SessionLocal
 from backend.models.incident import Incident
+from backend.models.daily_downtime import DailyDowntime
+from backend.models.website import Website
 
-def calculate_uptime(db: Session, website_id: int, start: datetime, end: datetime):
-    total_seconds = (end - start).total_seconds()
-    downtime = 0
 
-    incidents = (
-        db.query(Incident)
+def _split_by_day(start: datetime, end: datetime) -> dict:
+    per_day = {}
+    cursor = start
+    while cursor < end:
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), time())
+        chunk_end = min(end, next_midnight)
+        per_day[cursor.date()] = per_day.get(cursor.date(), 0) + (chunk_end - cursor).total_seconds()
+        cursor = chunk_end
+    return per_day
+
+
+def record_incident_downtime(db: Session, incident: Incident):
+    """
+    Add a resolved incident to the per-day downtime ledger. Open incidents
+    are not in the ledger; calculate_uptime adds them on the fly. The caller
+    commits.
+    """
+    if incident.resolved_at is None:
+        return
+
+    per_day = _split_by_day(incident.started_at, incident.resolved_at)
+    if not per_day:
+        return
+
+    existing = {
+        row.day: row
+        for row in db.query(DailyDowntime).filter(
+            DailyDowntime.website_id == incident.website_id,
+            DailyDowntime.day.in_(list(per_day)),
+        )
+    }
+
+    for day, seconds in per_day.items():
+        row = existing.get(day)
+        if row is None:
+            db.add(DailyDowntime(website_id=incident.website_id, day=day, downtime_seconds=seconds))
+        else:
+            row.downtime_seconds += seconds
+
+
+def rebuild_ledger(db: Session, website_id: int = None):
+    """Recompute the ledger from the incidents table (backfill / repair)."""
+    ledger = db.query(DailyDowntime)
+    incidents = db.query(Incident).filter(Incident.resolved_at.isnot(None))
+    if website_id is not None:
+        ledger = ledger.filter(DailyDowntime.website_id == website_id)
+        incidents = incidents.filter(Incident.website_id == website_id)
+
+    ledger.delete(synchronize_session=False)
+    for incident in incidents.yield_per(1000):
+        record_incident_downtime(db, incident)
+        db.flush()
+    db.commit()
+
+
+def _exact_downtime(db: Session, website_ids, start: datetime, end: datetime, open_only=False) -> dict:
+    """Incident overlap with [start, end) per website, from the incidents table."""
+    downtime = {}
+    if start >= end:
+        return downtime
+
+    query = db.query(Incident.website_id, Incident.started_at, Incident.resolved_at).filter(
+        Incident.website_id.in_(website_ids),
+        Incident.started_at < end,
+    )
+    if open_only:
+        query = query.filter(Incident.resolved_at.is_(None))
+    else:
+        query = query.filter(or_(Incident.resolved_at.is_(None), Incident.resolved_at > start))
+
+    for website_id, started_at, resolved_at in query:
+        inc_start = max(started_at, start)
+        inc_end = min(resolved_at or end, end)
+        if inc_start < inc_end:
+            downtime[website_id] = downtime.get(website_id, 0) + (inc_end - inc_start).total_seconds()
+
+    return downtime
+
+
+def _downtime_by_website(db: Session, website_ids, start: datetime, end: datetime) -> dict:
+    """
+    Whole UTC days come from the ledger (plus still-open incidents), the
+    partial days at either edge are computed exactly from incidents.
+    """
+    first_day = datetime.combine(start.date(), time())
+    if first_day < start:
+        first_day += timedelta(days=1)
+    last_day = datetime.combine(end.date(), time())
+
+    if first_day >= last_day:
+        return _exact_downtime(db, website_ids, start, end)
+
+    totals = {}
+
+    def add(part):
+        for website_id, seconds in part.items():
+            totals[website_id] = totals.get(website_id, 0) + seconds
+
+    add(_exact_downtime(db, website_ids, start, first_day))
+    add(_exact_downtime(db, website_ids, last_day, end))
+    add(_exact_downtime(db, website_ids, first_day, last_day, open_only=True))
+
+    add(dict(
+        db.query(DailyDowntime.website_id, func.sum(DailyDowntime.downtime_seconds))
         .filter(
-            Incident.website_id == website_id,
-            Incident.started_at < end,
+            DailyDowntime.website_id.in_(website_ids),
+            DailyDowntime.day >= first_day.date(),
+            DailyDowntime.day < last_day.date(),
         )
+        .group_by(DailyDowntime.website_id)
         .all()
-    )
+    ))
 
-    for inc in incidents:
-        inc_start = max(inc.started_at, start)
-        inc_end = min(inc.resolved_at or end, end)
+    return totals
 
-        if inc_start < inc_end:
-            downtime += (inc_end - inc_start).total_seconds()
 
-    uptime_percentage = round(
-        ((total_seconds - downtime) / total_seconds) * 100, 4
-    )
+def _uptime(downtime, total_seconds):
+    downtime = min(downtime, total_seconds)
+    if total_seconds <= 0:
+        uptime_percentage = 100.0  # an empty range has no downtime to count
+    else:
+        uptime_percentage = round(
+            ((total_seconds - downtime) / total_seconds) * 100, 4
+        )
 
     return {
         "uptime_percentage": uptime_percentage,
         "downtime_seconds": int(downtime),
         "total_seconds": int(total_seconds)
     }
+
+
+def calculate_uptime(db: Session, website_id: int, start: datetime, end: datetime):
+    total_seconds = (end - start).total_seconds()
+    downtime = _downtime_by_website(db, [website_id], start, end).get(website_id, 0)
+    return _uptime(downtime, total_seconds)
+
+
+def calculate_tenant_uptime(db: Session, tenant_id: str, start: datetime, end: datetime):
+    total_seconds = (end - start).total_seconds()
+
+    websites = (
+        db.query(Website.id, Website.url)
+        .filter(
+            Website.tenant_id == tenant_id,
+            Website.is_active == True,
+        )
+        .all()
+    )
+    if not websites:
+        return []
+
+    downtime = _downtime_by_website(db, [w.id for w in websites], start, end)
+
+    return [
+        {"website_id": w.id, "url": w.url, **_uptime(downtime.get(w.id, 0), total_seconds)}
+        for w in websites
+    ]
+
+
+if __name__ == "__main__":
+    # Backfill or repair the ledger, e.g. after importing incidents:
+    #     python -m backend.services.sla_service [website_id]
+    db = SessionLocal()
+    try:
+        rebuild_ledger(db, int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    finally:
+        db.close()
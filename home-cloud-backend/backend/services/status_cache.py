@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from backend.core.metrics import metrics
+
+STATUS_CACHE_SIZE = int(os.getenv("STATUS_CACHE_SIZE", 10000))  # pages
+STATUS_MISSING_CACHE_SIZE = int(os.getenv("STATUS_MISSING_CACHE_SIZE", 10000))  # unknown tokens
+# Upper bound on staleness when the result writer runs in another process
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", 30))  # seconds
+STATUS_MAX_AGE = int(os.getenv("STATUS_MAX_AGE", 10))  # Cache-Control max-age, seconds
+
+metrics.counter("status_cache_hits_total", "Public status requests served from memory")
+metrics.counter("status_cache_misses_total", "Public status requests that queried the database")
+metrics.counter("status_not_modified_total", "Public status requests answered with 304")
+
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class StatusPage:
+    __slots__ = ("website_id", "payload", "body", "etag", "expires_at")
+
+    def __init__(self, website_id, payload: Optional[dict], ttl: float):
+        self.website_id = website_id
+        self.payload = payload
+        # Rendered once; every hit serves the same bytes
+        self.body = json.dumps(payload, default=_json_default).encode() if payload is not None else None
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"' if self.body else None
+        self.expires_at = time.monotonic() + ttl
+
+
+class StatusCache:
+    """
+    Rendered public status payloads by token. The result writer patches
+    cached pages in place as results land (apply), so in-process the cache
+    tracks the live state without queries; entries also expire after `ttl`
+    so an API process fed by an external monitor catches up on its own.
+    Unknown tokens are cached too (payload None), so 404 floods stay off
+    the database; they live in a separate LRU, so random tokens can't
+    evict real pages.
+    """
+
+    def __init__(
+        self,
+        max_size: int = STATUS_CACHE_SIZE,
+        ttl: float = STATUS_CACHE_TTL,
+        max_missing: int = STATUS_MISSING_CACHE_SIZE,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_missing = max_missing
+        self._pages = OrderedDict()  # token -> StatusPage
+        self._missing = OrderedDict()  # token -> StatusPage with payload None
+        self._tokens = {}  # website id -> token
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[StatusPage]:
+        with self._lock:
+            for pages in (self._pages, self._missing):
+                page = pages.get(token)
+                if page is not None and page.expires_at > time.monotonic():
+                    pages.move_to_end(token)
+                    metrics.inc("status_cache_hits_total")
+                    return page
+
+        metrics.inc("status_cache_misses_total")
+        return None
+
+    def put(self, token: str, website_id, payload: Optional[dict]) -> StatusPage:
+        page = StatusPage(website_id, payload, self.ttl)
+        with self._lock:
+            self._store(token, page)
+        return page
+
+    def apply(self, results):
+        """Patch cached pages with the newest ProbeResult per site."""
+        with self._lock:
+            for r in results:
+                token = self._tokens.get(r.website_id)
+                page = self._pages.get(token) if token is not None else None
+                if page is None or page.payload is None:
+                    continue
+                self._store(token, StatusPage(r.website_id, {
+                    **page.payload,
+                    "status": "UP" if r.is_up else "DOWN",
+                    "last_checked": r.checked_at,
+                }, self.ttl))
+
+    def _store(self, token, page):
+        if page.payload is None:
+            self._missing[token] = page
+            self._missing.move_to_end(token)
+            while len(self._missing) > self.max_missing:
+                self._missing.popitem(last=False)
+            return
+
+        self._missing.pop(token, None)
+        self._pages[token] = page
+        self._pages.move_to_end(token)
+        if page.website_id is not None:
+            self._tokens[page.website_id] = token
+
+        while len(self._pages) > self.max_size:
+            _, evicted = self._pages.popitem(last=False)
+            if evicted.website_id is not None:
+                self._tokens.pop(evicted.website_id, None)
+
+    def invalidate_website(self, website_id):
+        with self._lock:
+            token = self._tokens.pop(website_id, None)
+            if token is not None:
+                self._pages.pop(token, None)
+
+
+status_cache = StatusCache()
+
+
+def render_status(website) -> dict:
+    return {
+        "url": website.url,
+        "status": website.last_status,
+        "last_checked": website.last_checked,
+    }
@@ -0,0 +1,42 @@
+import os
+import aiohttp
+from backend.core.background_loop import run_coroutine
+
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 10))  # seconds
+WEBHOOK_POOL_SIZE = int(os.getenv("WEBHOOK_POOL_SIZE", 20))
+
+# One keep-alive session for every webhook target, living on the shared
+# background loop; created on first use.
+_session = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=WEBHOOK_POOL_SIZE, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT),
+        )
+    return _session
+
+
+async def _post(url: str, payload: dict):
+    session = await _get_session()
+    async with session.post(url, json=payload) as response:
+        if response.status >= 400:
+            raise RuntimeError(f"Webhook {url} returned {response.status}: {await response.text()}")
+
+
+def send_slack(target: str, subject: str, body: str):
+    run_coroutine(_post(target, {"text": f"*{subject}*\n{body}"}))
+
+
+def send_webhook(target: str, subject: str, body: str):
+    run_coroutine(_post(target, {"subject": subject, "body": body}))
+
+
+def close():
+    global _session
+    if _session is not None and not _session.closed:
+        run_coroutine(_session.close())
+    _session = None
@@ -1,56 +1,50 @@
-import time
-import requests
-from datetime import datetime
-
-from core.database import SessionLocal
-from models.monitor_job import MonitorJob
-from models.website import Website
-from services.failure_classifier import classify_failure
-
-def process_jobs():
+import os
+
+from backend.core.database import SessionLocal
+from backend.models.website import Website
+from backend.services.job_queue import claim_jobs, complete_jobs
+from backend.services.probe_engine import probe_websites
+from backend.services.probe_pool import probe_pool
+from backend.services.result_writer import result_writer
+
+WORKER_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", 50))
+
+def process_jobs(worker_id: str, batch_size: int = WORKER_BATCH_SIZE, cluster=None) -> int:
+    """
+    Claim up to batch_size jobs, probe them concurrently and mark them done.
+    Returns the number of jobs claimed.
+    """
     db = SessionLocal()
 
     try:
-        job = (
-            db.query(MonitorJob)
-            .filter(MonitorJob.status == "pending")
-            .order_by(MonitorJob.created_at)
-            .first()
-        )
-
-        if not job:
-            return
-
-        website = db.query(Website).get(job.website_id)
-
-        response = None
-        exception = None
-        start = time.time()
-
-        try:
-            response = requests.get(website.url, timeout=5)
-        except Exception as e:
-            exception = e
-
-        elapsed_ms = int((time.time() - start) * 1000)
-
-        failure_type = classify_failure(
-            response=response,
-            exception=exception,
-            response_time_ms=elapsed_ms
-        )
-
-        website.last_checked = datetime.utcnow()
-        website.response_time_ms = elapsed_ms
-        website.failure_type = failure_type.value
-        website.last_status = (
-            str(response.status_code) if response else "ERROR"
+        if cluster is not None:
+            jobs = claim_jobs(
+                db, worker_id, batch_size,
+                owner=cluster.member_id,
+                live_members=cluster.live_members,
+            )
+        else:
+            jobs = claim_jobs(db, worker_id, batch_size)
+        if not jobs:
+            return 0
+
+        websites = (
+            db.query(Website.id, Website.url, Website.tenant_id)
+            .filter(
+                Website.id.in_({job.website_id for job in jobs}),
+                Website.is_active == True,
+            )
+            .all()
         )
 
-        job.status = "done"
-        job.executed_at = datetime.utcnow()
+        if probe_pool.running:
+            # Results stream to the writer from the pool's collector
+            probe_pool.run(websites)
+        else:
+            result_writer.add(probe_websites(websites))
 
-        db.commit()
+        complete_jobs(db, worker_id, [job.id for job in jobs])
+        return len(jobs)
 
     finally:
         db.close()
@@ -1,7 +1,35 @@
-import time
-from services.worker import process_jobs
+import os
+import socket
+import logging
+import threading
+from backend.services.worker import process_jobs, WORKER_BATCH_SIZE
 
-def worker_loop():
-    while True:
-        process_jobs()
-        time.sleep(5)
+WORKER_MIN_POLL = 0.5  # seconds
+WORKER_MAX_POLL = 5  # seconds
+
+logger = logging.getLogger(__name__)
+
+def worker_loop(worker_id: str = None, stop: threading.Event = None, cluster=None):
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    stop = stop or threading.Event()
+    delay = WORKER_MIN_POLL
+
+    while not stop.is_set():
+        try:
+            claimed = process_jobs(worker_id, WORKER_BATCH_SIZE, cluster)
+        except Exception:
+            # A failed claim or write must not stop this worker for good;
+            # unfinished jobs are picked up again when their lease expires
+            logger.exception("Worker %s iteration failed", worker_id)
+            delay = WORKER_MAX_POLL
+            stop.wait(delay)
+            continue
+
+        # A full batch means more work is probably waiting: go again at once
+        if claimed >= WORKER_BATCH_SIZE:
+            delay = WORKER_MIN_POLL
+            continue
+
+        # Otherwise back off while the queue stays empty
+        delay = WORKER_MIN_POLL if claimed else min(delay * 2, WORKER_MAX_POLL)
+        stop.wait(delay)
@@ -0,0 +1,76 @@
+import json
+import base64
+from datetime import datetime
+from fastapi import HTTPException, Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(values, default=lambda v: v.isoformat(), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _invalid_cursor():
+    return HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_cursor(cursor: str, *types) -> list:
+    """
+    Values of a cursor made by encode_cursor, checked against `types`
+    (int, str or datetime, one per keyset column). Anything else is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise _invalid_cursor()
+    if not isinstance(values, list) or len(values) != len(types):
+        raise _invalid_cursor()
+
+    decoded = []
+    for value, kind in zip(values, types):
+        if kind is datetime:
+            if not isinstance(value, str):
+                raise _invalid_cursor()
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise _invalid_cursor()
+        elif type(value) is not kind:  # exact, so True doesn't pass as an int
+            raise _invalid_cursor()
+        decoded.append(value)
+    return decoded
+
+
+def select_columns(model, fields: str | None, required=("id",)):
+    """
+    Columns for a `fields=a,b,c` projection; every column when fields is
+    empty. Columns in `required` (the keyset) are always selected.
+    """
+    table_columns = model.__table__.columns
+    if not fields:
+        return [getattr(model, c.key) for c in table_columns]
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    for name in reversed(required):
+        if name not in names:
+            names.insert(0, name)
+    return [getattr(model, name) for name in names]
+
+
+def paginate(response: Response, rows, limit: int, cursor_of):
+    """
+    Trim the extra row fetched to detect another page and set the next
+    cursor header. Rows keep the list shape existing clients expect.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cursor_of(rows[-1]))
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,126 @@
+"""
+Probe capacity as monitoring processes are added to one database.
+
+    cd home-cloud-backend
+    python -m benchmarks.cluster_demo [--members 1,2,4] [--sites 2000] [--seconds 30]
+
+For each member count, starts that many `python -m backend.monitor`
+processes against a fresh SQLite file (or BENCH_POSTGRES_URL) with sites
+pointing at a local stand-in HTTP server that answers after --delay ms.
+Each process is capped at --concurrency in-flight probes, so a single
+process cannot keep up; checks/second should grow with the member count
+until it meets demand (sites / interval). Prints per-member job counts to
+show the shard split and the elected leader.
+"""
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+
+from aiohttp import web
+from sqlalchemy import create_engine, text
+
+PORT = 8790
+
+
+def start_server(delay_ms):
+    async def handler(request):
+        await asyncio.sleep(delay_ms / 1000)
+        return web.Response(text="ok")
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get("/{site}", handler)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", PORT, backlog=4096).start())
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    time.sleep(0.5)
+
+
+def run(members, args, url):
+    env = dict(
+        os.environ,
+        DATABASE_URL=url,
+        APP_ENV="production",
+        PROBE_CONCURRENCY=str(args.concurrency),
+        PROBE_PER_HOST=str(args.concurrency),
+        SCHEDULER_RESYNC="5",
+        CLUSTER_HEARTBEAT="1",
+        CLUSTER_MEMBER_TTL="4",
+    )
+
+    # Fresh schema and sites for every run
+    subprocess.run(
+        [sys.executable, "-c", "from backend.monitor.__main__ import *; from backend.core.database import Base, engine; Base.metadata.drop_all(bind=engine); Base.metadata.create_all(bind=engine)"],
+        env=env, check=True,
+    )
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO websites (id, url, interval, is_active) VALUES (:id, :url, :interval, :active)"),
+            [{"id": i, "url": f"http://127.0.0.1:{PORT}/{i}", "interval": args.interval, "active": True} for i in range(1, args.sites + 1)],
+        )
+
+    procs = [
+        subprocess.Popen([sys.executable, "-m", "backend.monitor"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(members)
+    ]
+
+    # Let membership settle and the first interval of random offsets pass
+    time.sleep(args.interval + 5)
+    with engine.connect() as conn:
+        start = conn.execute(text("SELECT count(*) FROM monitoring_results")).scalar()
+    time.sleep(args.seconds)
+    with engine.connect() as conn:
+        end = conn.execute(text("SELECT count(*) FROM monitoring_results")).scalar()
+        per_member = conn.execute(text(
+            "SELECT leased_by, count(*) FROM monitor_jobs WHERE status = 'done' GROUP BY leased_by"
+        )).all()
+        leader = conn.execute(text("SELECT holder FROM cluster_leases WHERE name = 'scheduler'")).scalar()
+
+    for proc in procs:
+        proc.send_signal(signal.SIGTERM)
+    for proc in procs:
+        proc.wait(timeout=60)
+    engine.dispose()
+
+    split = {}
+    for leased_by, count in per_member:
+        member = leased_by.rsplit(":", 1)[0]
+        split[member] = split.get(member, 0) + count
+
+    print(f"{members} member(s): {(end - start) / args.seconds:8.1f} checks/s  (demand {args.sites / args.interval:.0f}/s)")
+    for member, count in sorted(split.items()):
+        print(f"    {member:<24} {count:>7} jobs{'  <- leader' if member == leader else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", default="1,2,4")
+    parser.add_argument("--sites", type=int, default=2000)
+    parser.add_argument("--interval", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--delay", type=int, default=200, help="server response delay in ms")
+    parser.add_argument("--concurrency", type=int, default=10, help="in-flight probes per process")
+    args = parser.parse_args()
+
+    start_server(args.delay)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("BENCH_POSTGRES_URL") or f"sqlite:///{os.path.join(tmp, 'cluster.db')}"
+        for members in (int(m) for m in args.members.split(",")):
+            run(members, args, url)
+
+
+if __name__ == "__main__":
+    main()
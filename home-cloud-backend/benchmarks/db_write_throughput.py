@@ -0,0 +1,121 @@
+"""
+Write throughput under concurrent readers for each database engine profile.
+
+    cd home-cloud-backend
+    python -m benchmarks.db_write_throughput [--seconds 10] [--writers 3] [--readers 4]
+
+Runs against a throwaway SQLite file with the rollback-journal and WAL
+profiles, and against Postgres too when BENCH_POSTGRES_URL is set (its
+tables are dropped afterwards). Writers insert MonitoringResult rows in
+executemany batches like the result writer does; readers run the
+per-website range query the dashboards use.
+"""
+import os
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, insert, select, func
+from sqlalchemy.exc import OperationalError
+
+from backend.core.database import Base, build_engine
+from backend.models.website import Website
+from backend.models.tenant import Tenant
+from backend.models.monitoring_result import MonitoringResult
+
+BATCH = 100
+WEBSITES = 200
+
+
+def run_profile(name, engine, seconds, writers, readers):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Website), [{"id": i, "url": f"http://site{i}.test"} for i in range(1, WEBSITES + 1)])
+
+    stop = threading.Event()
+    counts = {"rows": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        while not stop.is_set():
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "website_id": random.randint(1, WEBSITES),
+                    "status_code": 200,
+                    "response_time_ms": random.random() * 500,
+                    "error_type": "UP",
+                    "checked_at": datetime.utcnow(),
+                }
+                for _ in range(BATCH)
+            ]
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(MonitoringResult), rows)
+                with lock:
+                    counts["rows"] += BATCH
+            except OperationalError:
+                with lock:
+                    counts["errors"] += 1
+
+    def reader():
+        query = (
+            select(func.count(), func.avg(MonitoringResult.response_time_ms))
+            .where(MonitoringResult.website_id == bindparam("website_id"))
+        )
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    # A different site each time, like real dashboard traffic
+                    conn.execute(query, {"website_id": random.randint(1, WEBSITES)}).one()
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["errors"] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print(
+        f"{name:<22} {counts['rows'] / seconds:>10.0f} rows/s"
+        f" {counts['reads'] / seconds:>9.0f} reads/s {counts['errors']:>6} errors"
+    )
+
+    if engine.dialect.name != "sqlite":
+        Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=3)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers x {BATCH}-row batches, {args.readers} readers, {args.seconds:.0f}s each")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, wal in (("sqlite rollback", False), ("sqlite WAL", True)):
+            url = f"sqlite:///{os.path.join(tmp, name.replace(' ', '_'))}.db"
+            run_profile(name, build_engine(url, sqlite_wal=wal, echo_sample=0), args.seconds, args.writers, args.readers)
+
+    postgres_url = os.getenv("BENCH_POSTGRES_URL")
+    if postgres_url:
+        run_profile("postgres pooled", build_engine(postgres_url, echo_sample=0), args.seconds, args.writers, args.readers)
+
+
+if __name__ == "__main__":
+    main()
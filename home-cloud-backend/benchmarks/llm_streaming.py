@@ -0,0 +1,145 @@
+"""
+Time to first token for /ai/chat versus /ai/chat/stream.
+
+    cd home-cloud-backend
+    python -m benchmarks.llm_streaming [--tokens 200] [--token-ms 20] [--clients 20]
+
+Starts a fake Ollama server that streams --tokens NDJSON chunks, one every
+--token-ms, then runs the API with OLLAMA_URL pointed at it and has
+--clients concurrent clients call both endpoints. Reports time to first
+token (the whole response for /ai/chat) and total time.
+
+The fake server alone is handy for manual testing too:
+
+    python -m benchmarks.llm_streaming --serve-only
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import aiohttp
+from aiohttp import web
+
+OLLAMA_PORT = 8794
+API_PORT = 8795
+
+
+def fake_ollama(tokens: int, token_ms: float):
+    async def generate(request):
+        body = await request.json()
+        words = [f"tok{i} " for i in range(tokens)]
+
+        if not body.get("stream", True):
+            await asyncio.sleep(tokens * token_ms / 1000)
+            return web.json_response({"model": body["model"], "response": "".join(words), "done": True})
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for word in words:
+            await asyncio.sleep(token_ms / 1000)
+            await response.write(json.dumps({"model": body["model"], "response": word, "done": False}).encode() + b"\n")
+        await response.write(json.dumps({"model": body["model"], "response": "", "done": True}).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    return app
+
+
+def serve_in_thread(app, port):
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+async def login(session):
+    credentials = {"email": "bench@example.com", "password": "bench-password"}
+    base = f"http://127.0.0.1:{API_PORT}/api/auth"
+    async with session.post(f"{base}/register", params={**credentials, "tenant_name": "bench"}):
+        pass  # already registered on a reused database
+    async with session.post(f"{base}/login", params=credentials) as response:
+        return {"Authorization": f"Bearer {(await response.json())['access_token']}"}
+
+
+async def call(session, headers, path, n):
+    start = time.perf_counter()
+    first = None
+    # Distinct prompts, so neither the scheduler nor the reply cache folds them together
+    async with session.post(
+        f"http://127.0.0.1:{API_PORT}{path}", params={"prompt": f"hello {n} {time.time()}"}, headers=headers,
+    ) as response:
+        async for _ in response.content.iter_any():
+            if first is None:
+                first = time.perf_counter() - start
+        status = response.status
+    return first, time.perf_counter() - start, status
+
+
+async def measure(clients):
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None)) as session:
+        headers = await login(session)
+        for path in ("/ai/chat", "/ai/chat/stream"):
+            results = await asyncio.gather(*(call(session, headers, path, n) for n in range(clients)))
+            rejected = sum(1 for r in results if r[2] != 200)
+            results = [r for r in results if r[2] == 200] or [(float("nan"), float("nan"), 0)]
+            ttft = sorted(r[0] for r in results)
+            total = sorted(r[1] for r in results)
+            print(
+                f"  {path:<16} first byte p50={ttft[len(ttft) // 2] * 1000:8.1f}ms"
+                f"  total p50={total[len(total) // 2] * 1000:8.1f}ms  rejected={rejected}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--serve-only", action="store_true")
+    args = parser.parse_args()
+
+    if args.serve_only:
+        print(f"Fake Ollama on http://127.0.0.1:{OLLAMA_PORT}/api/generate")
+        web.run_app(fake_ollama(args.tokens, args.token_ms), host="127.0.0.1", port=OLLAMA_PORT, print=None)
+        return
+
+    serve_in_thread(fake_ollama(args.tokens, args.token_ms), OLLAMA_PORT)
+
+    env = dict(
+        os.environ,
+        OLLAMA_URL=f"http://127.0.0.1:{OLLAMA_PORT}/api/generate",
+        MONITOR_MODE="external",
+        # A file, not :memory:, so every pooled connection sees the bench user
+        DATABASE_URL=os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'llm_streaming.db')}"),
+        # Measure streaming, not queueing behind the scheduler's slots
+        LLM_SLOTS=os.getenv("LLM_SLOTS", str(args.clients)),
+        LLM_CACHE_PATH=os.getenv("LLM_CACHE_PATH", ""),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app", "--port", str(API_PORT), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        time.sleep(3)
+        print(f"{args.clients} concurrent clients, {args.tokens} tokens at {args.token_ms}ms each")
+        asyncio.run(measure(args.clients))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Login throughput and API latency under a login burst, per bcrypt cost.
+
+    cd home-cloud-backend
+    python -m benchmarks.login_throughput [--rounds 10,12] [--clients 50] [--seconds 10]
+
+For each BCRYPT_ROUNDS value, starts uvicorn against a throwaway SQLite
+file, seeds --users accounts, and has --clients concurrent clients log in
+as fast as they can. A separate client polls /health meanwhile to show
+whether the burst starves other endpoints. Reports successful logins/s,
+429 rejections and latency percentiles.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import aiohttp
+import bcrypt
+from sqlalchemy import create_engine, text
+
+PORT = 8791
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def load(seconds, clients, users):
+    base = f"http://127.0.0.1:{PORT}"
+    login_ms, health_ms = [], []
+    ok = rejected = 0
+    deadline = time.perf_counter() + seconds
+
+    async def login_client(n, session):
+        nonlocal ok, rejected
+        i = n
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            params = {"email": f"user{i % users}@bench.test", "password": PASSWORD}
+            async with session.post(f"{base}/api/auth/login", params=params) as response:
+                await response.read()
+                if response.status == 200:
+                    ok += 1
+                    login_ms.append((time.perf_counter() - start) * 1000)
+                elif response.status == 429:
+                    rejected += 1
+                    await asyncio.sleep(0.05)
+            i += clients
+
+    async def health_client(session):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            async with session.get(f"{base}/health") as response:
+                await response.read()
+            health_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.05)
+
+    connector = aiohttp.TCPConnector(limit=clients + 5)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(
+            health_client(session),
+            *(login_client(n, session) for n in range(clients)),
+        )
+
+    return ok / seconds, rejected, login_ms, health_ms
+
+
+def run(rounds, args, tmp):
+    db_path = os.path.join(tmp, f"login-{rounds}.db")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        MONITOR_MODE="external",
+        APP_ENV="production",
+        BCRYPT_ROUNDS=str(rounds),
+    )
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        time.sleep(3)  # schema is created on import
+
+        hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode()
+        engine = create_engine(env["DATABASE_URL"])
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO tenants (id, name) VALUES ('bench', 'bench')"))
+            conn.execute(
+                text("INSERT INTO users (id, email, hashed_password, tenant_id, is_active) VALUES (:id, :email, :hashed, 'bench', :active)"),
+                [{"id": f"u{i}", "email": f"user{i}@bench.test", "hashed": hashed, "active": True} for i in range(args.users)],
+            )
+        engine.dispose()
+
+        rate, rejected, login_ms, health_ms = asyncio.run(load(args.seconds, args.clients, args.users))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(
+        f"rounds={rounds:<3} {rate:8.1f} logins/s  429s={rejected:<6}"
+        f" login p50={percentile(login_ms, 0.5):7.1f}ms p95={percentile(login_ms, 0.95):7.1f}ms"
+        f"  /health p95={percentile(health_ms, 0.95):6.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", default="10,12")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rounds in (int(r) for r in args.rounds.split(",")):
+            run(rounds, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
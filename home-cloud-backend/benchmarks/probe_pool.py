@@ -0,0 +1,138 @@
+"""
+Probe throughput as probe processes are added.
+
+    cd home-cloud-backend
+    python -m benchmarks.probe_pool [--processes 0,1,2,4] [--sites 5000] [--servers 4]
+
+Starts a farm of local stand-in HTTP servers (one process each, so the
+farm isn't the bottleneck) and probes --sites targets spread across them,
+first on the in-process event loop (0) and then through a ProbePool with
+K child processes. Reports checks/second for each setting. Pass --tls to
+probe over HTTPS with a self-signed certificate, which is where the extra
+cores pay off most.
+"""
+import os
+import ssl
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+
+from aiohttp import web
+
+BASE_PORT = 8800
+
+
+def _serve(port, certfile, keyfile):
+    async def handler(request):
+        return web.Response(text="ok" * 256)
+
+    ssl_context = None
+    if certfile:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(certfile, keyfile)
+
+    app = web.Application()
+    app.router.add_get("/{site}", handler)
+    web.run_app(app, host="127.0.0.1", port=port, ssl_context=ssl_context, access_log=None, print=None, backlog=4096)
+
+
+def start_farm(servers, certfile=None, keyfile=None):
+    context = multiprocessing.get_context("spawn")
+    procs = [
+        context.Process(target=_serve, args=(BASE_PORT + i, certfile, keyfile), daemon=True)
+        for i in range(servers)
+    ]
+    for proc in procs:
+        proc.start()
+    time.sleep(1.5)
+    return procs
+
+
+def self_signed(directory):
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", keyfile, "-out", certfile],
+        check=True, capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def measure(processes, targets, rounds):
+    from backend.services.probe_engine import probe_websites, close_probe_engine
+    from backend.services.probe_pool import ProbePool
+
+    count = 0
+    lock = threading.Lock()
+
+    def sink(results):
+        nonlocal count
+        with lock:
+            count += len(results)
+
+    pool = None
+    if processes:
+        pool = ProbePool(processes, sink=sink)
+        pool.start()
+        pool.run(targets[:processes * 10])  # warm up connections in every child
+
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if pool is not None:
+            pool.run(targets)
+        else:
+            sink(probe_websites(targets))
+    elapsed = time.perf_counter() - start
+
+    if pool is not None:
+        pool.stop()
+    else:
+        close_probe_engine()
+
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", default="0,1,2,4")
+    parser.add_argument("--sites", type=int, default=5000)
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+
+    # Children read the engine limits from the environment; the pool (not
+    # the connector) should be the limit being measured
+    os.environ.setdefault("PROBE_CONCURRENCY", "500")
+    os.environ.setdefault("PROBE_PER_HOST", "500")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile = keyfile = None
+        if args.tls:
+            certfile, keyfile = self_signed(tmp)
+            # Trust the self-signed certificate in every probe process
+            os.environ["SSL_CERT_FILE"] = certfile
+
+        farm = start_farm(args.servers, certfile, keyfile)
+        scheme = "https" if args.tls else "http"
+        targets = [
+            (i, f"{scheme}://127.0.0.1:{BASE_PORT + i % args.servers}/{i}", None)
+            for i in range(1, args.sites + 1)
+        ]
+
+        print(f"{args.sites} sites on {args.servers} servers, {args.rounds} rounds ({scheme})")
+        for processes in (int(p) for p in args.processes.split(",")):
+            rate = measure(processes, targets, args.rounds)
+            label = "in-process loop" if processes == 0 else f"{processes} process(es)"
+            print(f"  {label:<18} {rate:10.0f} checks/s")
+
+        for proc in farm:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()